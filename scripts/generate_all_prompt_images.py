@@ -12,14 +12,28 @@ from pathlib import Path
 from datetime import datetime
 import time
 import fcntl
+import threading
+import functools
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.replicate_service import ReplicateService
-from src.utils.s3 import S3Client
+from botocore.config import Config
+
+# inotify lets slot waiters wake as soon as a lock is released (Linux only)
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+from src.replicate_service import ReplicateService, create_download_session
+from src.utils.s3 import S3Client, IMAGE_CONTENT_TYPES
+from src.utils.rate_limit import TokenBucket
+from src.utils import fast_json
+from src import actor_training_prompts
 from src.actor_training_prompts import get_actor_training_prompts, get_actor_descriptor
 
 logging.basicConfig(level=logging.INFO)
@@ -27,8 +41,215 @@ logger = logging.getLogger(__name__)
 
 # Limit concurrent Replicate requests to prevent rate limiting
 MAX_CONCURRENT_REQUESTS = 2
+# Sustained Replicate submission rate (requests per second) for this process
+REQUEST_RATE = 1.0
 LOCK_DIR = project_root / "data" / ".locks"
 LOCK_DIR.mkdir(parents=True, exist_ok=True)
+# Wait between lock attempts when inotify is unavailable
+SLOT_POLL_INTERVAL = 0.5
+# Upper bound on a single inotify wait, as a safety net for missed events
+SLOT_WATCH_INTERVAL = 5.0
+PROMPT_CACHE_DIR = project_root / "data" / ".cache"
+# Counter file (in each training_data dir) holding the next free image index
+NEXT_INDEX_FILE = ".next_index"
+
+
+@functools.lru_cache(maxsize=1)
+def _replicate() -> ReplicateService:
+    """Shared Replicate service, reused across calls in this process."""
+    return ReplicateService(session=create_download_session(MAX_CONCURRENT_REQUESTS))
+
+
+@functools.lru_cache(maxsize=1)
+def _s3_client() -> S3Client:
+    """Shared S3 client with a connection pool sized for background uploads."""
+    return S3Client(config=Config(
+        max_pool_connections=MAX_CONCURRENT_REQUESTS * 4,
+        retries={'mode': 'adaptive'}
+    ))
+
+
+def load_training_prompts(descriptor: str) -> list:
+    """
+    Get the training prompts for a descriptor, cached on disk between runs.
+    
+    The cache is invalidated whenever the prompt template modules change.
+    
+    Args:
+        descriptor: Actor descriptor (e.g., "man", "woman", "creature")
+        
+    Returns:
+        List of training prompts
+    """
+    cache_path = PROMPT_CACHE_DIR / f"prompts_{descriptor.replace(' ', '_')}.json"
+    prompts_module = Path(actor_training_prompts.__file__)
+    source_mtime = max(
+        prompts_module.stat().st_mtime,
+        prompts_module.with_name("prompt_color_stripper.py").stat().st_mtime
+    )
+    
+    try:
+        if cache_path.stat().st_mtime > source_mtime:
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    prompts = get_actor_training_prompts(descriptor)
+    
+    # Write atomically so concurrent runs never read a partial cache file
+    try:
+        PROMPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(prompts, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write prompt cache: {e}")
+    
+    return prompts
+
+
+def read_next_index(training_data_dir: Path, actor_name: str) -> int:
+    """
+    Get the next free image index for an actor's training data.
+    
+    Reads the NEXT_INDEX_FILE counter kept next to the images. The directory
+    is only scanned when the counter is missing or unreadable.
+    
+    Args:
+        training_data_dir: Actor's training_data directory
+        actor_name: Name of the actor (image filename prefix)
+        
+    Returns:
+        Next unused image index
+    """
+    try:
+        return int((training_data_dir / NEXT_INDEX_FILE).read_text().strip())
+    except (OSError, ValueError):
+        pass
+    
+    # Single scandir pass over the directory instead of one glob per extension
+    prefix = f"{actor_name}_"
+    max_index = -1
+    try:
+        with os.scandir(training_data_dir) as entries:
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name)
+                if ext not in ('.png', '.jpg') or not stem.startswith(prefix):
+                    continue
+                suffix = stem.rpartition('_')[2]
+                if suffix.isdigit():
+                    max_index = max(max_index, int(suffix))
+    except FileNotFoundError:
+        pass
+    
+    return max_index + 1
+
+
+@contextmanager
+def atomic_image_file(path: Path):
+    """
+    Open a file for writing an image so it only appears once complete.
+    
+    Yields a binary file object for a temporary file in the same directory.
+    On success the data is flushed to disk and the file is renamed over the
+    target; on error the temporary file is removed.
+    
+    Args:
+        path: Destination path
+    """
+    # os.open (rather than mkstemp) so the file gets the usual umask-based mode
+    tmp_name = path.with_name(f".{path.name}.{os.getpid()}.part")
+    fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            if hasattr(os, 'fdatasync'):
+                os.fdatasync(f.fileno())
+            else:
+                os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def upload_local_image(s3_client: S3Client, path: Path, bucket: str, key: str) -> dict:
+    """
+    Stream a saved image file to S3.
+    
+    Once uploaded, the file's pages are dropped from the page cache (where
+    supported) since nothing reads the image again.
+    
+    Args:
+        s3_client: S3 client
+        path: Local image path
+        bucket: S3 bucket name
+        key: S3 object key
+        
+    Returns:
+        Upload result from S3Client.upload_fileobj
+    """
+    with open(path, 'rb') as f:
+        result = s3_client.upload_fileobj(
+            fileobj=f,
+            bucket=bucket,
+            key=key,
+            content_type=IMAGE_CONTENT_TYPES['jpg']
+        )
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    return result
+
+
+def write_next_index(training_data_dir: Path, next_index: int) -> None:
+    """Atomically persist the next free image index."""
+    counter_path = training_data_dir / NEXT_INDEX_FILE
+    # Per-writer tmp name so concurrent writers never replace each other's file
+    tmp_path = counter_path.with_name(
+        f".{counter_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        tmp_path.write_text(str(next_index))
+        tmp_path.replace(counter_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def prompt_preview(prompt: str, limit: int) -> str:
+    """Truncate a prompt to limit characters, marking the cut with '...'."""
+    return prompt[:limit] + "..." if len(prompt) > limit else prompt
+
+
+@contextmanager
+def _watch_lock_dir():
+    """
+    Yield a wait(seconds) function for use between lock attempts.
+    
+    With inotify, the wait returns as soon as any lock file in LOCK_DIR is
+    closed (which happens when a holder releases its slot or exits).
+    Otherwise it falls back to sleeping for SLOT_POLL_INTERVAL.
+    """
+    # seconds is the time left until the caller's deadline and goes negative
+    # once it has passed; clamp so a negative inotify timeout never blocks forever
+    if inotify_simple is None:
+        yield lambda seconds: time.sleep(max(0, min(seconds, SLOT_POLL_INTERVAL)))
+        return
+    
+    watcher = inotify_simple.INotify()
+    try:
+        watcher.add_watch(str(LOCK_DIR), inotify_simple.flags.CLOSE_WRITE)
+        yield lambda seconds: watcher.read(
+            timeout=max(0, int(min(seconds, SLOT_WATCH_INTERVAL) * 1000))
+        )
+    finally:
+        watcher.close()
 
 
 @contextmanager
@@ -49,15 +270,16 @@ def acquire_request_slot(slot_number: int, timeout: int = 300):
     
     try:
         # Try to acquire lock with timeout
-        while time.time() - start_time < timeout:
-            try:
-                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                acquired = True
-                logger.info(f"Acquired request slot {slot_number}")
-                break
-            except BlockingIOError:
-                # Slot is busy, wait a bit
-                time.sleep(0.5)
+        with _watch_lock_dir() as wait:
+            while time.time() - start_time < timeout:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    logger.info(f"Acquired request slot {slot_number}")
+                    break
+                except BlockingIOError:
+                    # Slot is busy, wait for a release
+                    wait(timeout - (time.time() - start_time))
         
         if not acquired:
             raise TimeoutError(f"Could not acquire request slot {slot_number} within {timeout}s")
@@ -80,27 +302,38 @@ def acquire_any_request_slot(timeout: int = 300):
     """
     start_time = time.time()
     
-    while time.time() - start_time < timeout:
-        # Try each slot in order
-        for slot in range(MAX_CONCURRENT_REQUESTS):
-            lock_file_path = LOCK_DIR / f"replicate_slot_{slot}.lock"
-            lock_file = open(lock_file_path, 'w')
-            
-            try:
-                # Try non-blocking lock
-                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                logger.info(f"Acquired request slot {slot} (max {MAX_CONCURRENT_REQUESTS} concurrent)")
-                
-                # Return context manager
-                return _slot_context(lock_file, slot)
+    # Keep the lock files open while waiting: closing them here would
+    # generate the very CLOSE_WRITE events the watcher wakes up on.
+    lock_files = [
+        open(LOCK_DIR / f"replicate_slot_{slot}.lock", 'w')
+        for slot in range(MAX_CONCURRENT_REQUESTS)
+    ]
+    acquired_slot = None
+    
+    try:
+        with _watch_lock_dir() as wait:
+            while time.time() - start_time < timeout:
+                # Try each slot in order
+                for slot, lock_file in enumerate(lock_files):
+                    try:
+                        # Try non-blocking lock
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        logger.info(f"Acquired request slot {slot} (max {MAX_CONCURRENT_REQUESTS} concurrent)")
+                        acquired_slot = slot
+                        
+                        # Return context manager
+                        return _slot_context(lock_file, slot)
+                        
+                    except BlockingIOError:
+                        # This slot is busy, try next one
+                        continue
                 
-            except BlockingIOError:
-                # This slot is busy, try next one
+                # All slots busy, wait for a release
+                wait(timeout - (time.time() - start_time))
+    finally:
+        for slot, lock_file in enumerate(lock_files):
+            if slot != acquired_slot:
                 lock_file.close()
-                continue
-        
-        # All slots busy, wait a bit
-        time.sleep(0.5)
     
     raise TimeoutError(f"Could not acquire any request slot within {timeout}s")
 
@@ -120,7 +353,8 @@ def generate_all_prompt_images(
     actor_name: str,
     base_image_path: str,
     actor_type: str = "person",
-    actor_sex: str = None
+    actor_sex: str = None,
+    pretty: bool = False
 ) -> dict:
     """
     Generate one training image for each available prompt.
@@ -130,6 +364,8 @@ def generate_all_prompt_images(
         base_image_path: Path to base/poster image
         actor_type: Type of actor (default: "person")
         actor_sex: Sex of actor ("male", "female", or None)
+        pretty: Indent the metadata files on the final write (per-image
+            progress writes are always compact)
         
     Returns:
         dict with generation results
@@ -138,13 +374,14 @@ def generate_all_prompt_images(
     
     # Get descriptor and prompts
     descriptor = get_actor_descriptor(actor_type, actor_sex)
-    all_prompts = get_actor_training_prompts(descriptor)
+    all_prompts = load_training_prompts(descriptor)
     
     logger.info(f"Found {len(all_prompts)} prompts to generate")
     
-    # Initialize services
-    replicate = ReplicateService()
-    s3_client = S3Client()
+    # Initialize services (cached at module scope so repeated calls reuse
+    # the same HTTP connection pools)
+    replicate = _replicate()
+    s3_client = _s3_client()
     
     # Read base image once
     with open(base_image_path, 'rb') as f:
@@ -158,18 +395,7 @@ def generate_all_prompt_images(
     training_data_dir.mkdir(parents=True, exist_ok=True)
     
     # Find starting index
-    existing_files = list(training_data_dir.glob(f"{actor_name}_*.png"))
-    existing_files += list(training_data_dir.glob(f"{actor_name}_*.jpg"))
-    existing_indices = []
-    for f in existing_files:
-        try:
-            parts = f.stem.split('_')
-            if parts[-1].isdigit():
-                existing_indices.append(int(parts[-1]))
-        except:
-            pass
-    
-    next_index = max(existing_indices, default=-1) + 1
+    next_index = read_next_index(training_data_dir, actor_name)
     
     # Load existing metadata
     metadata_path = training_data_dir / "prompt_metadata.json"
@@ -198,10 +424,67 @@ def generate_all_prompt_images(
     results = []
     bucket_name = os.getenv("AWS_SYSTEM_ACTORS_BUCKET", "story-boards-assets")
     
+    # S3 uploads run in the background so the upload of one image overlaps
+    # with generating the next. Only one upload is in flight at a time; it is
+    # finalized (metadata written) before the next one is submitted.
+    upload_executor = ThreadPoolExecutor(max_workers=1)
+    pending_upload = None
+    
+    # Throttle submissions to the API; only waits when requests outpace the rate
+    rate_limiter = TokenBucket(rate=REQUEST_RATE, burst=MAX_CONCURRENT_REQUESTS)
+    
+    def finish_upload(pending) -> None:
+        """Wait for an in-flight S3 upload and record its metadata."""
+        upload_future, local_filename, index, prompt, log_preview, metadata_preview = pending
+        
+        try:
+            s3_url = upload_future.result()['Location']
+        except Exception as e:
+            logger.error(f"Failed to upload image {index}: {e}")
+            results.append({
+                "index": index,
+                "error": str(e),
+                "prompt_preview": log_preview
+            })
+            return
+        
+        logger.info(f"Uploaded to S3: {s3_url}")
+        
+        # Add to response.json
+        response_data["output"]["output"]["s3_image_urls"].append(s3_url)
+        
+        # Add to metadata
+        metadata["images"][local_filename] = {
+            "prompt": prompt,
+            "prompt_preview": metadata_preview,
+            "generated_at": datetime.now().isoformat(),
+            "s3_url": s3_url,
+            "index": index
+        }
+        
+        results.append({
+            "index": index,
+            "filename": local_filename,
+            "s3_url": s3_url,
+            "prompt_preview": log_preview
+        })
+        
+        # Save metadata and response.json after each successful image
+        # This ensures progress is preserved even if the script crashes
+        fast_json.dump_file(metadata, metadata_path)
+        fast_json.dump_file(response_data, response_json_path)
+        
+        logger.info(f"Metadata saved for {local_filename}")
+    
     for i, prompt in enumerate(all_prompts, 1):
-        logger.info(f"[{i}/{len(all_prompts)}] Generating with prompt: {prompt[:80]}...")
+        # Previews are computed once and shared by logs, metadata and results
+        log_preview = prompt_preview(prompt, 80)
+        metadata_preview = prompt_preview(prompt, 100)
+        logger.info(f"[{i}/{len(all_prompts)}] Generating with prompt: {log_preview}")
         
         try:
+            rate_limiter.take()
+            
             # Acquire file-based lock to limit concurrent requests across all processes
             with acquire_any_request_slot(timeout=300) as slot:
                 logger.info(f"[{i}/{len(all_prompts)}] Using slot {slot}")
@@ -218,84 +501,59 @@ def generate_all_prompt_images(
                     logger.error(f"Generation failed or timed out: {gen_error}")
                     raise
                 
-                # Download generated image
-                generated_bytes = replicate.download_image_as_bytes(generated_url)
-            
-            # Save locally
-            local_filename = f"{actor_name}_{next_index}.jpg"
-            local_path = training_data_dir / local_filename
+                # Pick the local filename, skipping indices taken by files
+                # another tool added without updating the counter
+                while (training_data_dir / f"{actor_name}_{next_index}.png").exists() or \
+                        (training_data_dir / f"{actor_name}_{next_index}.jpg").exists():
+                    next_index += 1
+                local_filename = f"{actor_name}_{next_index}.jpg"
+                local_path = training_data_dir / local_filename
+                
+                # Stream the generated image straight to disk
+                with atomic_image_file(local_path) as f:
+                    replicate.download_image_to_file(generated_url, f)
             
-            with open(local_path, 'wb') as f:
-                f.write(generated_bytes)
+            write_next_index(training_data_dir, next_index + 1)
             
             logger.info(f"Saved locally: {local_path}")
             
-            # Upload to S3
+            # Finalize the previous image's upload before queueing this one
+            if pending_upload is not None:
+                previous_upload, pending_upload = pending_upload, None
+                finish_upload(previous_upload)
+            
+            # Upload to S3 in the background, streamed from the saved file
             s3_key = f"system_actors/training_data/{actor_name}/{local_filename}"
-            result = s3_client.upload_image(
-                image_data=generated_bytes,
-                bucket=bucket_name,
-                key=s3_key,
-                extension='jpg'
+            upload_future = upload_executor.submit(
+                upload_local_image, s3_client, local_path, bucket_name, s3_key
+            )
+            pending_upload = (
+                upload_future, local_filename, next_index,
+                prompt, log_preview, metadata_preview
             )
-            s3_url = result['Location']
-            
-            logger.info(f"Uploaded to S3: {s3_url}")
-            
-            # Add to response.json
-            response_data["output"]["output"]["s3_image_urls"].append(s3_url)
-            
-            # Add to metadata
-            metadata["images"][local_filename] = {
-                "prompt": prompt,
-                "prompt_preview": prompt[:100] + "..." if len(prompt) > 100 else prompt,
-                "generated_at": datetime.now().isoformat(),
-                "s3_url": s3_url,
-                "index": next_index
-            }
-            
-            results.append({
-                "index": next_index,
-                "filename": local_filename,
-                "s3_url": s3_url,
-                "prompt_preview": prompt[:80] + "..."
-            })
             
             next_index += 1
             
-            # Save metadata and response.json after each successful image
-            # This ensures progress is preserved even if the script crashes
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
-            
-            with open(response_json_path, 'w') as f:
-                json.dump(response_data, f, indent=2)
-            
-            logger.info(f"Metadata saved for image {i}/{len(all_prompts)}")
-            
-            # Small delay between requests to be respectful to API
-            if i < len(all_prompts):
-                time.sleep(1)
-            
         except Exception as e:
             logger.error(f"Failed to generate image {i}: {e}")
+            if pending_upload is not None:
+                previous_upload, pending_upload = pending_upload, None
+                finish_upload(previous_upload)
             results.append({
                 "index": next_index,
                 "error": str(e),
-                "prompt_preview": prompt[:80] + "..."
+                "prompt_preview": log_preview
             })
             next_index += 1
-            
-            # Small delay even on error before retrying next prompt
-            if i < len(all_prompts):
-                time.sleep(2)
     
-    # Final save of metadata and response.json (redundant but ensures completeness)
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    # Wait for the last upload to complete
+    if pending_upload is not None:
+        finish_upload(pending_upload)
+    upload_executor.shutdown(wait=True)
     
-    with open(response_json_path, 'w') as f:
-        json.dump(response_data, f, indent=2)
+    # Final save of metadata and response.json (redundant but ensures completeness)
+    fast_json.dump_file(metadata, metadata_path, indent=pretty)
+    fast_json.dump_file(response_data, response_json_path, indent=pretty)
     
     logger.info(f"Completed! Generated {len(results)} images")
     
@@ -313,22 +571,26 @@ def generate_all_prompt_images(
 
 def main():
     """Main entry point for CLI usage."""
-    if len(sys.argv) < 3:
-        print("Usage: python generate_all_prompt_images.py <actor_name> <base_image_path> [actor_type] [actor_sex]")
+    pretty = "--pretty" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--pretty"]
+    
+    if len(args) < 2:
+        print("Usage: python generate_all_prompt_images.py <actor_name> <base_image_path> [actor_type] [actor_sex] [--pretty]")
         print("Example: python generate_all_prompt_images.py 0000_european_16_male /path/to/base.png person male")
         sys.exit(1)
     
-    actor_name = sys.argv[1]
-    base_image_path = sys.argv[2]
-    actor_type = sys.argv[3] if len(sys.argv) > 3 else "person"
-    actor_sex = sys.argv[4] if len(sys.argv) > 4 else None
+    actor_name = args[0]
+    base_image_path = args[1]
+    actor_type = args[2] if len(args) > 2 else "person"
+    actor_sex = args[3] if len(args) > 3 else None
     
     try:
         result = generate_all_prompt_images(
             actor_name=actor_name,
             base_image_path=base_image_path,
             actor_type=actor_type,
-            actor_sex=actor_sex
+            actor_sex=actor_sex,
+            pretty=pretty
         )
         
         # Output JSON for Node.js to parse
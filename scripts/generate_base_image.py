@@ -7,7 +7,13 @@ import sys
 import json
 import logging
 import os
+import asyncio
+import functools
+from collections import deque
 from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -22,9 +28,24 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _serverless_client() -> RunPodServerlessClient:
+    """Shared RunPod client, so repeated calls reuse its HTTP session."""
+    return RunPodServerlessClient()
+
+
+@functools.lru_cache(maxsize=1)
+def _workflow_builder() -> WorkflowBuilder:
+    """Shared workflow builder, so the template is only loaded once."""
+    return WorkflowBuilder()
+
+
 def find_images_in_response(data: dict) -> list:
     """
-    Recursively search for 'images' array in nested response structure.
+    Search for 'images' array in nested response structure.
+    
+    Walks the nested dictionaries breadth-first, so the shallowest non-empty
+    'images' list is returned without recursing into deeper levels.
     
     Args:
         data: Response dictionary from RunPod
@@ -32,46 +53,43 @@ def find_images_in_response(data: dict) -> list:
     Returns:
         List of base64 image strings, or empty list if not found
     """
-    if isinstance(data, dict):
-        # Check if current level has 'images' key
-        if 'images' in data and isinstance(data['images'], list):
-            return data['images']
+    queue = deque([data])
+    while queue:
+        node = queue.popleft()
+        if not isinstance(node, dict):
+            continue
+        
+        # Check if current level has a non-empty 'images' list
+        images = node.get('images')
+        if isinstance(images, list) and images:
+            return images
         
-        # Recursively search in nested dictionaries
-        for value in data.values():
-            if isinstance(value, dict):
-                result = find_images_in_response(value)
-                if result:
-                    return result
+        # Queue nested dictionaries for the next level
+        queue.extend(value for value in node.values() if isinstance(value, dict))
     
     return []
 
 
-def generate_base_image(
+def _prepare_base_image_request(
     description: str,
     actor_name: str,
-    outfit: str = None,
-    width: int = 1024,
-    height: int = 1536,
-    steps: int = 25,
-    seed: int = -1,
-    flux_guidance: float = 3.5
+    outfit: Optional[str],
+    width: int,
+    height: int,
+    steps: int,
+    seed: int,
+    flux_guidance: float,
+    job_index: Optional[int] = None
 ) -> dict:
     """
-    Generate a base image for an actor.
+    Build the prompt and RunPod payload for a base image.
     
-    Args:
-        description: Character description (e.g., "european 25 year old male with short brown hair")
-        actor_name: Actor folder name (e.g., "0000_european_16_male")
-        outfit: Outfit description (optional, e.g., "casual jeans and t-shirt")
-        width: Image width (default: 1024 for portrait)
-        height: Image height (default: 1536 for full body portrait)
-        steps: Sampling steps (default: 25 for high quality)
-        seed: Random seed (-1 for random)
-        flux_guidance: FLUX guidance value (default: 3.5)
+    Shared by the blocking and async entrypoints, which only differ in how
+    the RunPod request is sent.
     
     Returns:
-        Result dictionary with status and image data
+        Dict with "payload", "seed" and "metadata" keys, or a FAILED result
+        dictionary if the clients or workflow could not be set up
     """
     logger.info("="*80)
     logger.info("BASE IMAGE GENERATION")
@@ -104,12 +122,13 @@ Full body visible from head to toe.
 Direct eye contact with camera or slight angle.
 Clean composition, no distracting elements."""
     
-    logger.info(f"Generated prompt: {prompt[:200]}...")
+    # %.200s truncates during formatting, only if the record is emitted
+    logger.info("Generated prompt: %.200s...", prompt)
     
     # Initialize clients
     try:
-        serverless_client = RunPodServerlessClient()
-        workflow_builder = WorkflowBuilder()
+        _serverless_client()
+        workflow_builder = _workflow_builder()
         logger.info("✓ Clients initialized")
     except Exception as e:
         logger.error(f"Failed to initialize clients: {e}")
@@ -163,28 +182,39 @@ Clean composition, no distracting elements."""
     try:
         debug_dir = Path(__file__).parent.parent / "debug"
         debug_dir.mkdir(exist_ok=True)
-        payload_debug_path = debug_dir / "base_image_full_payload.json"
+        suffix = "" if job_index is None else f"_{job_index}"
+        payload_debug_path = debug_dir / f"base_image_full_payload{suffix}.json"
         with open(payload_debug_path, 'w') as f:
             json.dump(payload, f, indent=2)
         logger.info(f"✓ Full payload saved to: {payload_debug_path}")
     except Exception as e:
         logger.warning(f"Could not save debug payload: {e}")
     
-    # Generate image using wizard endpoint (RUNPOD_SERVER_100_ID)
-    logger.info("Sending request to RunPod serverless...")
-    try:
-        result = serverless_client.generate_image(
-            payload=payload["payload"],  # Extract the inner payload
-            mode="wizard",
-            request_id=f"base_{actor_name}"
-        )
-    except Exception as e:
-        logger.error(f"RunPod request failed: {e}")
-        return {
-            "status": "FAILED",
-            "error": f"RunPod error: {str(e)}"
+    return {
+        "payload": payload,
+        "seed": workflow_params["seed"],
+        "metadata": {
+            "actor_name": actor_name,
+            "description": description,
+            "width": width,
+            "height": height,
+            "steps": steps,
+            "prompt": prompt
         }
+    }
+
+
+def _finish_base_image(result: Optional[dict], request: dict) -> dict:
+    """
+    Turn a RunPod response into the base image result dictionary.
     
+    Args:
+        result: Response from the RunPod serverless client (None on failure)
+        request: Prepared request from _prepare_base_image_request
+    
+    Returns:
+        Result dictionary with status and image data
+    """
     if not result:
         logger.error("No result from RunPod")
         return {
@@ -203,8 +233,11 @@ Clean composition, no distracting elements."""
             "runpod_response": result
         }
     
-    # Search for images array in the response (handles any nested structure)
-    images = find_images_in_response(result)
+    # Images normally sit at output.output.images; only scan the whole
+    # response (handles any nested structure) when they are not there
+    images = ((result.get("output") or {}).get("output") or {}).get("images")
+    if not isinstance(images, list) or not images:
+        images = find_images_in_response(result)
     
     if not images:
         logger.error("No images found in response")
@@ -228,18 +261,139 @@ Clean composition, no distracting elements."""
                 "images": [first_image]
             }
         },
-        "seed": workflow_params["seed"],
-        "metadata": {
-            "actor_name": actor_name,
-            "description": description,
-            "width": width,
-            "height": height,
-            "steps": steps,
-            "prompt": prompt
-        }
+        "seed": request["seed"],
+        "metadata": request["metadata"]
     }
 
 
+def generate_base_image(
+    description: str,
+    actor_name: str,
+    outfit: str = None,
+    width: int = 1024,
+    height: int = 1536,
+    steps: int = 25,
+    seed: int = -1,
+    flux_guidance: float = 3.5
+) -> dict:
+    """
+    Generate a base image for an actor.
+    
+    Args:
+        description: Character description (e.g., "european 25 year old male with short brown hair")
+        actor_name: Actor folder name (e.g., "0000_european_16_male")
+        outfit: Outfit description (optional, e.g., "casual jeans and t-shirt")
+        width: Image width (default: 1024 for portrait)
+        height: Image height (default: 1536 for full body portrait)
+        steps: Sampling steps (default: 25 for high quality)
+        seed: Random seed (-1 for random)
+        flux_guidance: FLUX guidance value (default: 3.5)
+    
+    Returns:
+        Result dictionary with status and image data
+    """
+    request = _prepare_base_image_request(
+        description, actor_name, outfit, width, height, steps, seed, flux_guidance
+    )
+    if request.get("status") == "FAILED":
+        return request
+    
+    # Generate image using wizard endpoint (RUNPOD_SERVER_100_ID)
+    logger.info("Sending request to RunPod serverless...")
+    try:
+        result = _serverless_client().generate_image(
+            payload=request["payload"]["payload"],  # Extract the inner payload
+            mode="wizard",
+            request_id=f"base_{actor_name}"
+        )
+    except Exception as e:
+        logger.error(f"RunPod request failed: {e}")
+        return {
+            "status": "FAILED",
+            "error": f"RunPod error: {str(e)}"
+        }
+    
+    return _finish_base_image(result, request)
+
+
+def generate_base_images(actors: List[Dict[str, Any]]) -> List[dict]:
+    """
+    Generate base images for several actors concurrently.
+    
+    Args:
+        actors: List of keyword-argument dicts for generate_base_image
+            (each needs at least "description" and "actor_name")
+    
+    Returns:
+        List of result dictionaries, in the same order as actors
+    """
+    async def run_all() -> List[dict]:
+        async with httpx.AsyncClient() as client:
+            return await asyncio.gather(*[
+                generate_base_image_async(**actor, client=client, job_index=index)
+                for index, actor in enumerate(actors)
+            ])
+    
+    return asyncio.run(run_all())
+
+
+async def generate_base_image_async(
+    description: str,
+    actor_name: str,
+    outfit: str = None,
+    width: int = 1024,
+    height: int = 1536,
+    steps: int = 25,
+    seed: int = -1,
+    flux_guidance: float = 3.5,
+    client: Optional[httpx.AsyncClient] = None,
+    job_index: Optional[int] = None
+) -> dict:
+    """
+    Generate a base image for an actor without blocking the event loop.
+    
+    Args:
+        description: Character description (e.g., "european 25 year old male with short brown hair")
+        actor_name: Actor folder name (e.g., "0000_european_16_male")
+        outfit: Outfit description (optional, e.g., "casual jeans and t-shirt")
+        width: Image width (default: 1024 for portrait)
+        height: Image height (default: 1536 for full body portrait)
+        steps: Sampling steps (default: 25 for high quality)
+        seed: Random seed (-1 for random)
+        flux_guidance: FLUX guidance value (default: 3.5)
+        client: Optional shared httpx.AsyncClient for the RunPod requests
+        job_index: Position in a concurrent batch, used to give each job its
+            own debug payload file
+    
+    Returns:
+        Result dictionary with status and image data
+    """
+    request = _prepare_base_image_request(
+        description, actor_name, outfit, width, height, steps, seed, flux_guidance,
+        job_index=job_index
+    )
+    if request.get("status") == "FAILED":
+        return request
+    
+    # Generate image using wizard endpoint (RUNPOD_SERVER_100_ID)
+    logger.info("Sending request to RunPod serverless...")
+    try:
+        result = await _serverless_client().generate_image_async(
+            payload=request["payload"]["payload"],  # Extract the inner payload
+            mode="wizard",
+            request_id=f"base_{actor_name}",
+            client=client
+        )
+    except Exception as e:
+        logger.error(f"RunPod request failed: {e}")
+        return {
+            "status": "FAILED",
+            "error": f"RunPod error: {str(e)}"
+        }
+    
+    return _finish_base_image(result, request)
+
+
 def main():
     """Main entry point for CLI usage."""
     if len(sys.argv) < 3:
@@ -2,14 +2,20 @@
 """
 Generate image captions using GPT Vision API.
 Reads input from stdin and outputs JSON results to stdout.
+
+Send all images for a run in one invocation: a single OpenAI client (and its
+keep-alive connection pool) serves the whole batch, whereas one process per
+image pays a fresh TCP/TLS handshake for every request.
 """
 import sys
 import json
 import os
-import base64
+import asyncio
+import functools
+import io
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from PIL import Image
-from io import BytesIO
+from typing import Optional
 
 # Add parent directory to path to import src modules
 project_root = Path(__file__).parent.parent
@@ -26,59 +32,54 @@ except ImportError:
     print("Warning: python-dotenv not installed, .env file not loaded", file=sys.stderr)
 
 from src.utils.openai_client import OpenAIClient, OpenAIConfig
+from src.utils import fast_json
+from src.utils.paths import find_existing_paths
+from src.utils.image_processing import resize_image_for_gpt_cached
 from src.utils.gpt_models import DEFAULT_VISION_MODEL, is_vision_model
 from src.utils.caption_prompts import get_caption_prompts, DEFAULT_SYSTEM_PROMPT, DEFAULT_USER_PROMPT
 
+# Resized images are cached here and shared by generate_captions/generate_prompts
+GPT_IMAGE_CACHE_DIR = project_root / "data" / ".cache" / "img_b64"
+
+# Number of images processed concurrently. Keep this under the OpenAI account's
+# rate limits; the "concurrency" input field overrides it per batch.
+DEFAULT_CONCURRENCY = int(os.getenv("CAPTION_CONCURRENCY", "8"))
+
 
-def resize_image_for_gpt(image_path: str, max_size: int = 768) -> str:
+@functools.lru_cache(maxsize=8)
+def describe_request(system_prompt: str, user_prompt: str, model: str) -> str:
     """
-    Resize image to reduce token usage while maintaining aspect ratio.
-    Returns base64 encoded image.
+    Format the request summary logged for each caption.
     
-    Args:
-        image_path: Path to image file
-        max_size: Maximum dimension (width or height)
-    
-    Returns:
-        Base64 encoded resized image with data URI prefix
+    The summary only depends on the prompts and model, which are shared by
+    every image in a batch, so it is built once and cached.
     """
-    try:
-        with Image.open(image_path) as img:
-            # Convert to RGB if necessary (handles RGBA, P, etc.)
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Calculate new size maintaining aspect ratio
-            width, height = img.size
-            if width > max_size or height > max_size:
-                if width > height:
-                    new_width = max_size
-                    new_height = int(height * (max_size / width))
-                else:
-                    new_height = max_size
-                    new_width = int(width * (max_size / height))
-                
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Save to BytesIO and convert to base64
-            buffer = BytesIO()
-            img.save(buffer, format='JPEG', quality=85)
-            img_bytes = buffer.getvalue()
-            
-            # Create base64 string with data URI
-            b64_string = base64.b64encode(img_bytes).decode('utf-8')
-            return f"data:image/jpeg;base64,{b64_string}"
-            
-    except Exception as e:
-        raise Exception(f"Failed to process image {image_path}: {str(e)}")
+    is_gpt5 = model.lower().startswith("gpt-5")
+    lines = [
+        f"\n🤖 [GPT-REQUEST] Preparing request:",
+        f"   Model: {model}",
+        f"   Temperature: {1.0 if is_gpt5 else 0.7}",
+        f"   Max tokens: {1000 if is_gpt5 else 300}",
+    ]
+    if is_gpt5:
+        lines.append(f"   ℹ️  GPT-5 uses reasoning tokens - increased max_tokens to accommodate")
+    lines += [
+        f"   System prompt length: {len(system_prompt) if system_prompt else 0} chars",
+        f"   User prompt length: {len(user_prompt)} chars",
+        f"\n📝 [SYSTEM-PROMPT]:\n{(system_prompt or '')[:200]}...",
+        f"\n📝 [USER-PROMPT]:\n{user_prompt[:200]}...",
+        "",
+    ]
+    return "\n".join(lines)
 
 
-def generate_caption(
+async def generate_caption(
     client: OpenAIClient,
     image_path: str,
     system_prompt: str,
     user_prompt: str,
-    model: str = DEFAULT_VISION_MODEL
+    model: str = DEFAULT_VISION_MODEL,
+    executor: Optional[Executor] = None
 ) -> dict:
     """
     Generate caption for a single image.
@@ -89,21 +90,28 @@ def generate_caption(
         system_prompt: System message for GPT
         user_prompt: User prompt for caption generation
         model: Vision model to use
+        executor: Executor for the CPU-bound resize (default: the loop's thread pool)
     
     Returns:
         Dict with filename and generated caption or error
     """
     filename = os.path.basename(image_path)
     
+    # Diagnostics are buffered and written to stderr in one call, so
+    # concurrent captions don't interleave or contend on the stderr lock
+    log = io.StringIO()
+    
     try:
-        print(f"\n{'='*80}", file=sys.stderr)
-        print(f"🎯 [CAPTION-GEN] Starting caption generation for: {filename}", file=sys.stderr)
-        print(f"{'='*80}", file=sys.stderr)
+        print(f"\n{'='*80}", file=log)
+        print(f"🎯 [CAPTION-GEN] Starting caption generation for: {filename}", file=log)
+        print(f"{'='*80}", file=log)
         
         # Resize and encode image
-        print(f"📸 [IMAGE] Resizing image: {image_path}", file=sys.stderr)
-        image_base64 = resize_image_for_gpt(image_path)
-        print(f"✅ [IMAGE] Image resized and encoded (base64 length: {len(image_base64)} chars)", file=sys.stderr)
+        print(f"📸 [IMAGE] Resizing image: {image_path}", file=log)
+        image_base64 = await asyncio.get_running_loop().run_in_executor(
+            executor, resize_image_for_gpt_cached, image_path, GPT_IMAGE_CACHE_DIR
+        )
+        print(f"✅ [IMAGE] Image resized and encoded (base64 length: {len(image_base64)} chars)", file=log)
         
         # Determine temperature and max_tokens based on model
         # GPT-5 only supports default temperature (1.0)
@@ -112,42 +120,34 @@ def generate_caption(
         temperature = 1.0 if is_gpt5 else 0.7
         max_tokens = 1000 if is_gpt5 else 300  # GPT-5 needs more tokens for reasoning + output
         
-        print(f"\n🤖 [GPT-REQUEST] Preparing request:", file=sys.stderr)
-        print(f"   Model: {model}", file=sys.stderr)
-        print(f"   Temperature: {temperature}", file=sys.stderr)
-        print(f"   Max tokens: {max_tokens}", file=sys.stderr)
-        if is_gpt5:
-            print(f"   ℹ️  GPT-5 uses reasoning tokens - increased max_tokens to accommodate", file=sys.stderr)
-        print(f"   System prompt length: {len(system_prompt) if system_prompt else 0} chars", file=sys.stderr)
-        print(f"   User prompt length: {len(user_prompt)} chars", file=sys.stderr)
-        print(f"\n📝 [SYSTEM-PROMPT]:\n{system_prompt[:200]}...", file=sys.stderr)
-        print(f"\n📝 [USER-PROMPT]:\n{user_prompt[:200]}...", file=sys.stderr)
+        log.write(describe_request(system_prompt, user_prompt, model))
         
-        print(f"\n🚀 [GPT-REQUEST] Sending request to OpenAI API...", file=sys.stderr)
+        print(f"\n🚀 [GPT-REQUEST] Sending request to OpenAI API...", file=log)
         
         # Generate caption using vision model
         # The OpenAIClient will handle GPT-5 parameter differences automatically
-        caption = client.vision_completion(
+        caption = await client.vision_completion_async(
             prompt=user_prompt,
             image_base64=image_base64,
+            image_mime_type='image/jpeg',
             model=model,
             system_message=system_prompt if system_prompt else None,
             temperature=temperature,
             max_tokens=max_tokens
         )
         
-        print(f"✅ [GPT-RESPONSE] Received response from OpenAI", file=sys.stderr)
-        print(f"📄 [CAPTION] Generated caption ({len(caption)} chars):", file=sys.stderr)
-        print(f"   \"{caption}\"", file=sys.stderr)
+        print(f"✅ [GPT-RESPONSE] Received response from OpenAI", file=log)
+        print(f"📄 [CAPTION] Generated caption ({len(caption)} chars):", file=log)
+        print(f"   \"{caption}\"", file=log)
         
         # Check if caption is empty
         if not caption or not caption.strip():
-            print(f"⚠️  [WARNING] Caption is empty! This might indicate:", file=sys.stderr)
-            print(f"   - GPT returned an empty response", file=sys.stderr)
-            print(f"   - API error that wasn't caught", file=sys.stderr)
-            print(f"   - Prompt issues causing no output", file=sys.stderr)
+            print(f"⚠️  [WARNING] Caption is empty! This might indicate:", file=log)
+            print(f"   - GPT returned an empty response", file=log)
+            print(f"   - API error that wasn't caught", file=log)
+            print(f"   - Prompt issues causing no output", file=log)
         
-        print(f"{'='*80}\n", file=sys.stderr)
+        print(f"{'='*80}\n", file=log)
         
         return {
             'filename': filename,
@@ -156,14 +156,69 @@ def generate_caption(
         }
         
     except Exception as e:
-        print(f"❌ [ERROR] Caption generation failed for {filename}:", file=sys.stderr)
-        print(f"   Error: {str(e)}", file=sys.stderr)
-        print(f"{'='*80}\n", file=sys.stderr)
+        print(f"❌ [ERROR] Caption generation failed for {filename}:", file=log)
+        print(f"   Error: {str(e)}", file=log)
+        print(f"{'='*80}\n", file=log)
         return {
             'filename': filename,
             'success': False,
             'error': str(e)
         }
+    
+    finally:
+        sys.stderr.write(log.getvalue())
+        sys.stderr.flush()
+
+
+async def process_all(
+    client: OpenAIClient,
+    images: list,
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> list:
+    """
+    Caption all images concurrently, at most `concurrency` at a time.
+    
+    Args:
+        client: OpenAI client instance
+        images: Image entries from the input ({"path", "filename"})
+        system_prompt: System message for GPT
+        user_prompt: User prompt for caption generation
+        model: Vision model to use
+        concurrency: Maximum number of in-flight OpenAI requests
+    
+    Returns:
+        List of result dicts, in the same order as images
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    existing = find_existing_paths(img_data.get('path', '') for img_data in images)
+    
+    async def caption_one(img_data: dict) -> dict:
+        image_path = img_data.get('path', '')
+        
+        if image_path not in existing:
+            return {
+                'filename': img_data.get('filename', ''),
+                'success': False,
+                'error': f'Image file not found: {image_path}'
+            }
+        
+        async with semaphore:
+            return await generate_caption(
+                client, image_path, system_prompt, user_prompt, model, executor
+            )
+    
+    # Resize/encode in worker processes so JPEG work runs in parallel and
+    # overlaps with the network-bound OpenAI calls
+    executor = ProcessPoolExecutor(max_workers=max(1, min(os.cpu_count() or 1, len(images))))
+    
+    try:
+        return await asyncio.gather(*(caption_one(img_data) for img_data in images))
+    finally:
+        executor.shutdown(cancel_futures=True)
+        await client.async_client.close()
 
 
 def main():
@@ -178,8 +233,8 @@ def main():
             print(json.dumps(result))
             sys.exit(1)
         
-        # Read input from stdin
-        input_data = json.loads(sys.stdin.read())
+        # Read input from stdin (raw bytes; orjson parses UTF-8 directly)
+        input_data = fast_json.loads(sys.stdin.buffer.read())
         images = input_data.get('images', [])
         
         # Use provided prompts or fall back to defaults from caption_prompts.py
@@ -187,6 +242,7 @@ def main():
         system_prompt = input_data.get('systemPrompt', DEFAULT_SYSTEM_PROMPT)
         user_prompt = input_data.get('userPrompt', DEFAULT_USER_PROMPT)
         model = input_data.get('model', DEFAULT_VISION_MODEL)
+        concurrency = max(1, int(input_data.get('concurrency', DEFAULT_CONCURRENCY)))
         
         if not images:
             result = {
@@ -207,32 +263,25 @@ def main():
         # Initialize OpenAI client
         client = OpenAIClient()
         
-        # Process each image
-        results = []
-        for img_data in images:
-            image_path = img_data.get('path', '')
-            
-            if not os.path.exists(image_path):
-                results.append({
-                    'filename': img_data.get('filename', ''),
-                    'success': False,
-                    'error': f'Image file not found: {image_path}'
-                })
-                continue
-            
-            result = generate_caption(client, image_path, system_prompt, user_prompt, model)
-            results.append(result)
-        
-        # Output results as JSON
+        # Process all images concurrently
+        results = asyncio.run(process_all(
+            client, images, system_prompt, user_prompt, model, concurrency
+        ))
+        
+        # Output results as JSON (one pass to count successes)
+        successful = sum(r['success'] for r in results)
         output = {
             'success': True,
             'results': results,
             'total': len(results),
-            'successful': sum(1 for r in results if r['success']),
-            'failed': sum(1 for r in results if not r['success'])
+            'successful': successful,
+            'failed': len(results) - successful
         }
         
-        print(json.dumps(output))
+        sys.stdout.flush()
+        sys.stdout.buffer.write(fast_json.dumps(output))
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.flush()
         
     except json.JSONDecodeError as e:
         result = {
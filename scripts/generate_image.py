@@ -2,9 +2,13 @@
 """
 Image generation script using RunPod serverless.
 Receives payload via stdin and sends to RunPod serverless endpoint.
+
+Stdin is either a single payload, or {"payloads": [...]} to run several jobs
+concurrently; a batch prints {"results": [...]} in the same order.
 """
 import sys
 import json
+import asyncio
 import logging
 import time
 import os
@@ -23,7 +27,9 @@ if env_path.exists():
 else:
     logging.warning(f".env file not found at {env_path}")
 
-from runpod import generate_serverless_image
+import httpx
+
+from runpod import generate_serverless_image, RunPodServerlessClient
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +39,42 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def generate_batch(payloads: list, api_key: str) -> list:
+    """
+    Run several RunPod jobs concurrently on one event loop.
+    
+    Each job awaits /runsync and polls its status with backoff, so the batch
+    takes about as long as its slowest job rather than the sum of all jobs.
+    
+    Args:
+        payloads: Generation payloads
+        api_key: RunPod API key
+    
+    Returns:
+        Result dicts, in the same order as payloads
+    """
+    serverless_client = RunPodServerlessClient(api_key=api_key)
+    batch_id = int(time.time() * 1000)
+    
+    async with httpx.AsyncClient() as http_client:
+        results = await asyncio.gather(*[
+            serverless_client.generate_image_async(
+                payload,
+                mode="150",  # Use RUNPOD_SERVER_150_ID endpoint
+                request_id=f"img2img_{batch_id}_{i}",
+                client=http_client
+            )
+            for i, payload in enumerate(payloads)
+        ], return_exceptions=True)
+    
+    return [
+        {"status": "FAILED", "error": str(result)} if isinstance(result, Exception)
+        else {"status": "FAILED", "error": "RunPod returned None result"} if result is None
+        else result
+        for result in results
+    ]
+
+
 def main():
     """Main entry point for image generation."""
     try:
@@ -44,9 +86,13 @@ def main():
             raise ValueError("No payload received on stdin")
         
         payload = json.loads(payload_json)
+        payloads = payload.get("payloads") if isinstance(payload, dict) else None
         logger.info(f"Payload loaded successfully")
-        logger.info(f"Workflow nodes: {len(payload.get('input', {}).get('workflow', {}))}")
-        logger.info(f"Model URLs: {len(payload.get('input', {}).get('model_urls', []))}")
+        if payloads is None:
+            logger.info(f"Workflow nodes: {len(payload.get('input', {}).get('workflow', {}))}")
+            logger.info(f"Model URLs: {len(payload.get('input', {}).get('model_urls', []))}")
+        else:
+            logger.info(f"Batch of {len(payloads)} payloads")
         
         # Send to RunPod serverless
         # Check if API key is available
@@ -62,6 +108,16 @@ def main():
         logger.info(f"   API Key: {api_key[:10]}...")
         logger.info(f"   Endpoint ID: {endpoint_id}")
         logger.info(f"   Mode: 150 (RUNPOD_SERVER_150_ID)")
+        
+        if payloads is not None:
+            logger.info(f"Sending {len(payloads)} requests to RunPod serverless concurrently...")
+            results = asyncio.run(generate_batch(payloads, api_key))
+            completed = sum(1 for r in results if r.get("status") == "COMPLETED")
+            logger.info(f"RunPod batch finished: {completed}/{len(results)} completed")
+            
+            print(json.dumps({"results": results}))
+            sys.exit(0)
+        
         logger.info("Sending request to RunPod serverless...")
         
         result = generate_serverless_image(
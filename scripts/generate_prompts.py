@@ -2,14 +2,19 @@
 """
 Generate image prompts using GPT Vision API.
 Reads input from stdin and outputs JSON results to stdout.
+
+Send all images for a run in one invocation: a single OpenAI client (and its
+keep-alive connection pool) serves the whole batch, whereas one process per
+image pays a fresh TCP/TLS handshake for every request.
 """
 import sys
 import json
 import os
-import base64
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from PIL import Image
-from io import BytesIO
+from urllib.parse import unquote
+from typing import Optional
 
 # Add parent directory to path to import src modules
 project_root = Path(__file__).parent.parent
@@ -26,58 +31,39 @@ except ImportError:
     print("Warning: python-dotenv not installed, .env file not loaded", file=sys.stderr)
 
 from src.utils.openai_client import OpenAIClient, OpenAIConfig
+from src.utils import fast_json
+from src.utils.paths import find_existing_paths
+from src.utils.image_processing import resize_image_for_gpt_cached
 from src.utils.gpt_models import DEFAULT_VISION_MODEL, is_vision_model
 
+# Web path prefix the UI uses for files under <project_root>/resources
+RESOURCES_PREFIX = '/resources/'
 
-def resize_image_for_gpt(image_path: str, max_size: int = 768) -> str:
-    """
-    Resize image to reduce token usage while maintaining aspect ratio.
-    Returns base64 encoded image.
-    
-    Args:
-        image_path: Path to image file
-        max_size: Maximum dimension (width or height)
+# Resized images are cached here and shared by generate_captions/generate_prompts
+GPT_IMAGE_CACHE_DIR = project_root / "data" / ".cache" / "img_b64"
+
+# Number of images processed concurrently. Keep this under the OpenAI account's
+# rate limits; the "concurrency" input field overrides it per batch.
+DEFAULT_CONCURRENCY = int(os.getenv("PROMPT_CONCURRENCY", "8"))
+
+
+def to_filesystem_path(image_path: str) -> str:
+    """Convert a /resources/ web path to a filesystem path; other paths pass through."""
+    if not image_path.startswith(RESOURCES_PREFIX):
+        return image_path
     
-    Returns:
-        Base64 encoded resized image with data URI prefix
-    """
-    try:
-        with Image.open(image_path) as img:
-            # Convert to RGB if necessary (handles RGBA, P, etc.)
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Calculate new size maintaining aspect ratio
-            width, height = img.size
-            if width > max_size or height > max_size:
-                if width > height:
-                    new_width = max_size
-                    new_height = int(height * (max_size / width))
-                else:
-                    new_height = max_size
-                    new_width = int(width * (max_size / height))
-                
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Save to BytesIO and convert to base64
-            buffer = BytesIO()
-            img.save(buffer, format='JPEG', quality=85)
-            img_bytes = buffer.getvalue()
-            
-            # Create base64 string with data URI
-            b64_string = base64.b64encode(img_bytes).decode('utf-8')
-            return f"data:image/jpeg;base64,{b64_string}"
-            
-    except Exception as e:
-        raise Exception(f"Failed to process image {image_path}: {str(e)}")
+    # URL decode the part after the prefix and resolve it under the project's
+    # resources directory (pathlib handles the separators)
+    return str(project_root / 'resources' / unquote(image_path[len(RESOURCES_PREFIX):]))
 
 
-def generatePrompt(
+async def generatePrompt(
     client: OpenAIClient,
     image_path: str,
     system_prompt: str,
     user_prompt: str,
-    model: str = DEFAULT_VISION_MODEL
+    model: str = DEFAULT_VISION_MODEL,
+    executor: Optional[Executor] = None
 ) -> dict:
     """
     Generate prompt for a single image.
@@ -87,6 +73,8 @@ def generatePrompt(
         image_path: Path to image file
         system_prompt: System message for GPT
         user_prompt: User prompt for prompt generation
+        model: Vision model to use
+        executor: Executor for the CPU-bound resize (default: the loop's thread pool)
     
     Returns:
         Dict with filename and generated prompt or error
@@ -95,12 +83,15 @@ def generatePrompt(
     
     try:
         # Resize and encode image
-        image_base64 = resize_image_for_gpt(image_path)
+        image_base64 = await asyncio.get_running_loop().run_in_executor(
+            executor, resize_image_for_gpt_cached, image_path, GPT_IMAGE_CACHE_DIR
+        )
         
         # Generate prompt using vision model
-        prompt = client.vision_completion(
+        prompt = await client.vision_completion_async(
             prompt=user_prompt,
             image_base64=image_base64,
+            image_mime_type='image/jpeg',
             model=model,
             system_message=system_prompt if system_prompt else None,
             temperature=0.7,
@@ -121,6 +112,58 @@ def generatePrompt(
         }
 
 
+async def process_all(
+    client: OpenAIClient,
+    images: list,
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> list:
+    """
+    Generate prompts for all images concurrently, at most `concurrency` at a time.
+    
+    Args:
+        client: OpenAI client instance
+        images: Image entries from the input ({"path", "filename"})
+        system_prompt: System message for GPT
+        user_prompt: User prompt for prompt generation
+        model: Vision model to use
+        concurrency: Maximum number of in-flight OpenAI requests
+    
+    Returns:
+        List of result dicts, in the same order as images
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    fs_paths = [to_filesystem_path(img_data.get('path', '')) for img_data in images]
+    existing = find_existing_paths(fs_paths)
+    
+    async def prompt_one(img_data: dict, fs_path: str) -> dict:
+        if fs_path not in existing:
+            return {
+                'filename': img_data.get('filename', ''),
+                'success': False,
+                'error': f'Image file not found: {fs_path}'
+            }
+        
+        async with semaphore:
+            return await generatePrompt(
+                client, fs_path, system_prompt, user_prompt, model, executor
+            )
+    
+    # Resize/encode in worker processes so JPEG work runs in parallel and
+    # overlaps with the network-bound OpenAI calls
+    executor = ProcessPoolExecutor(max_workers=max(1, min(os.cpu_count() or 1, len(images))))
+    
+    try:
+        return await asyncio.gather(*(
+            prompt_one(img_data, fs_path) for img_data, fs_path in zip(images, fs_paths)
+        ))
+    finally:
+        executor.shutdown(cancel_futures=True)
+        await client.async_client.close()
+
+
 def main():
     """Main function to process prompt generation requests."""
     try:
@@ -133,12 +176,13 @@ def main():
             print(json.dumps(result))
             sys.exit(1)
         
-        # Read input from stdin
-        input_data = json.loads(sys.stdin.read())
+        # Read input from stdin (raw bytes; orjson parses UTF-8 directly)
+        input_data = fast_json.loads(sys.stdin.buffer.read())
         images = input_data.get('images', [])
         system_prompt = input_data.get('systemPrompt', '')
         user_prompt = input_data.get('userPrompt', '')
         model = input_data.get('model', DEFAULT_VISION_MODEL)
+        concurrency = max(1, int(input_data.get('concurrency', DEFAULT_CONCURRENCY)))
         
         if not images:
             result = {
@@ -159,47 +203,25 @@ def main():
         # Initialize OpenAI client
         client = OpenAIClient()
         
-        # Process each image
-        results = []
-        for img_data in images:
-            image_path = img_data.get('path', '')
-            
-            # Convert web path to filesystem path
-            if image_path.startswith('/resources/'):
-                # Remove /resources/ prefix and resolve relative to project root
-                relative_path = image_path.replace('/resources/', '')
-                fs_path = os.path.join(
-                    os.path.dirname(os.path.dirname(__file__)),
-                    'resources',
-                    relative_path.replace('/', os.sep)
-                )
-                # URL decode the filename
-                from urllib.parse import unquote
-                fs_path = unquote(fs_path)
-            else:
-                fs_path = image_path
-            
-            if not os.path.exists(fs_path):
-                results.append({
-                    'filename': img_data.get('filename', ''),
-                    'success': False,
-                    'error': f'Image file not found: {fs_path}'
-                })
-                continue
-            
-            result = generatePrompt(client, fs_path, system_prompt, user_prompt, model)
-            results.append(result)
+        # Process all images concurrently
+        results = asyncio.run(process_all(
+            client, images, system_prompt, user_prompt, model, concurrency
+        ))
         
-        # Output results as JSON
+        # Output results as JSON (one pass to count successes)
+        successful = sum(r['success'] for r in results)
         output = {
             'success': True,
             'results': results,
             'total': len(results),
-            'successful': sum(1 for r in results if r['success']),
-            'failed': sum(1 for r in results if not r['success'])
+            'successful': successful,
+            'failed': len(results) - successful
         }
         
-        print(json.dumps(output))
+        sys.stdout.flush()
+        sys.stdout.buffer.write(fast_json.dumps(output))
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.flush()
         
     except json.JSONDecodeError as e:
         result = {
@@ -17,7 +17,9 @@ sys.path.insert(0, str(project_root))
 
 from src.replicate_service import ReplicateService
 from src.utils.s3 import S3Client
+from src.utils.fast_base64 import b64encode
 from src.actor_training_prompts import get_actor_training_prompts, get_actor_descriptor
+from scripts.generate_all_prompt_images import read_next_index, write_next_index
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,7 +30,8 @@ def generate_single_training_image(
     base_image_path: str,
     prompt: str,
     actor_type: str = "person",
-    actor_sex: str = None
+    actor_sex: str = None,
+    next_index: int = None
 ) -> dict:
     """
     Generate a single training image from base image using Replicate.
@@ -39,6 +42,8 @@ def generate_single_training_image(
         prompt: Generation prompt
         actor_type: Type of actor (default: "person")
         actor_sex: Sex of actor ("male", "female", or None)
+        next_index: Index for the new image, for batch callers that track it
+                    (default: read from the training_data counter file)
         
     Returns:
         dict with generated image info
@@ -49,10 +54,9 @@ def generate_single_training_image(
     # Initialize Replicate service
     replicate = ReplicateService()
     
-    # Read base image and convert to base64
-    with open(base_image_path, 'rb') as f:
-        import base64
-        base_image_base64 = base64.b64encode(f.read()).decode('utf-8')
+    # Read base image and convert to base64 (the raw bytes are not kept
+    # alive alongside the encoded string)
+    base_image_base64 = b64encode(Path(base_image_path).read_bytes())
     
     logger.info(f"Base image loaded: {len(base_image_base64)} bytes")
     
@@ -74,26 +78,24 @@ def generate_single_training_image(
     training_data_dir = project_root / "data" / "actors" / actor_name / "training_data"
     training_data_dir.mkdir(parents=True, exist_ok=True)
     
-    # Find next available index
-    existing_files = list(training_data_dir.glob(f"{actor_name}_*.png"))
-    existing_files += list(training_data_dir.glob(f"{actor_name}_*.jpg"))
-    existing_indices = []
-    for f in existing_files:
-        try:
-            # Extract index from filename like "0000_european_16_male_5.png"
-            parts = f.stem.split('_')
-            if parts[-1].isdigit():
-                existing_indices.append(int(parts[-1]))
-        except:
-            pass
-    
-    next_index = max(existing_indices, default=-1) + 1
+    # Find next available index (counter file, scanning only as a fallback)
+    if next_index is None:
+        next_index = read_next_index(training_data_dir, actor_name)
+    while (training_data_dir / f"{actor_name}_{next_index}.png").exists() or \
+            (training_data_dir / f"{actor_name}_{next_index}.jpg").exists():
+        next_index += 1
     local_filename = f"{actor_name}_{next_index}.jpg"
     local_path = training_data_dir / local_filename
     
     with open(local_path, 'wb') as f:
         f.write(generated_bytes)
     
+    # Never move the counter backwards when the caller passed an older index
+    write_next_index(
+        training_data_dir,
+        max(next_index + 1, read_next_index(training_data_dir, actor_name))
+    )
+    
     logger.info(f"Saved locally: {local_path}")
     
     # Upload to S3
@@ -6,11 +6,16 @@ Reads input from stdin and outputs JSON results to stdout.
 import sys
 import json
 import os
-import base64
+import functools
 import logging
+import logging.handlers
+import queue
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
 from dotenv import load_dotenv
-from PIL import Image, ImageEnhance
+from PIL import Image, ImageStat
 from io import BytesIO
 
 # Add parent directory to path to import src modules
@@ -28,6 +33,8 @@ except ImportError:
     print("Warning: python-dotenv not installed, .env file not loaded", file=sys.stderr)
 
 from src.runpod import generate_serverless_image
+from src.utils import fast_json
+from src.utils.fast_base64 import b64encode
 
 # Configure logging
 logging.basicConfig(
@@ -37,6 +44,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of images generated concurrently (overridable via "concurrency" in the input)
+DEFAULT_CONCURRENCY = int(os.getenv("TRAINING_CONCURRENCY", "8"))
+
+# Workflow nodes whose inputs are overwritten per image
+PATCHED_NODE_IDS = ('132', '150', '205', '215', '216')
+
+
+class _PrefixAdapter(logging.LoggerAdapter):
+    """Prefix log messages so interleaved output from worker threads stays readable."""
+    
+    def process(self, msg, kwargs):
+        return f"{self.extra['prefix']} {msg}", kwargs
+
+
+@contextmanager
+def _queued_logging():
+    """
+    Route root logging through a queue while worker threads are running.
+    
+    Workers then only enqueue records; a single listener thread does the
+    stderr writes, so threads don't contend on the handler lock. The
+    original handlers are restored (and the queue drained) on exit.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        root.handlers = handlers
+
 
 def apply_monochrome_filter(image: Image.Image, contrast: float, brightness: float) -> Image.Image:
     """
@@ -50,24 +93,71 @@ def apply_monochrome_filter(image: Image.Image, contrast: float, brightness: flo
     Returns:
         Filtered PIL Image
     """
-    # Convert to grayscale
     grayscale = image.convert('L')
     
+    # Fold contrast and brightness into one 256-entry lookup table so both
+    # adjustments are a single pass over the grayscale pixels. point() walks
+    # the 8-bit buffer in C with the GIL released and avoids the float32
+    # round-trip a NumPy version would need, so it also covers 4K frames.
+    if contrast != 1.0 or brightness != 1.0:
+        grayscale = grayscale.point(_monochrome_lut(grayscale, contrast, brightness))
+    
     # Convert back to RGB mode (required for further processing)
-    rgb_grayscale = Image.new('RGB', grayscale.size)
-    rgb_grayscale.paste(grayscale)
+    return grayscale.convert('RGB')
+
+
+def _monochrome_lut(grayscale: Image.Image, contrast: float, brightness: float) -> list:
+    """
+    Build a lookup table matching ImageEnhance.Contrast followed by
+    ImageEnhance.Brightness (same mean pivot and clamping, to within one
+    level of float rounding).
+    """
+    def blend(value: float) -> int:
+        return 0 if value <= 0.0 else 255 if value >= 255.0 else int(value)
     
-    # Apply contrast adjustment
+    lut = list(range(256))
     if contrast != 1.0:
-        enhancer = ImageEnhance.Contrast(rgb_grayscale)
-        rgb_grayscale = enhancer.enhance(contrast)
-    
-    # Apply brightness adjustment
+        mean = int(ImageStat.Stat(grayscale).mean[0] + 0.5)
+        lut = [blend(mean + contrast * (v - mean)) for v in lut]
     if brightness != 1.0:
-        enhancer = ImageEnhance.Brightness(rgb_grayscale)
-        rgb_grayscale = enhancer.enhance(brightness)
+        lut = [blend(brightness * v) for v in lut]
+    return lut
+
+
+# Entries are multi-MB base64 strings; a handful covers repeats within a batch
+@functools.lru_cache(maxsize=8)
+def _encode_image_cached(image_path: str, mtime_ns: int, apply_monochrome: bool,
+                         mono_contrast: float, mono_brightness: float) -> str:
+    """
+    Cached worker for encode_image_to_base64.
     
-    return rgb_grayscale
+    mtime_ns is only part of the cache key, so editing the file invalidates
+    its entry.
+    """
+    # Load image with PIL (only the header is read until pixels are needed)
+    with Image.open(image_path) as img:
+        # Upright RGB JPEGs without a filter are sent as-is, skipping decode +
+        # re-encode (a non-default EXIF Orientation would rotate them downstream)
+        if (img.format == 'JPEG' and img.mode == 'RGB' and not apply_monochrome
+                and img.getexif().get(0x0112, 1) == 1):
+            return b64encode(Path(image_path).read_bytes())
+        
+        # Convert to RGB if necessary
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        
+        # Apply monochrome filter if requested
+        if apply_monochrome:
+            img = apply_monochrome_filter(img, mono_contrast, mono_brightness)
+            logger.info("  Applied monochrome filter (contrast: %s, brightness: %s)", mono_contrast, mono_brightness)
+        
+        # Convert to JPEG bytes (single-pass Huffman, baseline)
+        buffer = BytesIO()
+        img.save(buffer, format='JPEG', quality=95, optimize=False, progressive=False)
+        
+        # Encode to base64 straight from the buffer (no getvalue() copy)
+        with buffer.getbuffer() as image_bytes:
+            return b64encode(image_bytes)
 
 
 def encode_image_to_base64(image_path: str, apply_monochrome: bool = False, 
@@ -75,6 +165,9 @@ def encode_image_to_base64(image_path: str, apply_monochrome: bool = False,
     """
     Read image file, optionally apply monochrome filter, and convert to base64 string.
     
+    Results are cached per (path, mtime, monochrome settings), so an image
+    that appears several times in a batch is only encoded once.
+    
     Args:
         image_path: Path to image file
         apply_monochrome: Whether to apply monochrome filter
@@ -85,25 +178,9 @@ def encode_image_to_base64(image_path: str, apply_monochrome: bool = False,
         Base64 encoded string
     """
     try:
-        # Load image with PIL
-        with Image.open(image_path) as img:
-            # Convert to RGB if necessary
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Apply monochrome filter if requested
-            if apply_monochrome:
-                img = apply_monochrome_filter(img, mono_contrast, mono_brightness)
-                logger.info(f"  Applied monochrome filter (contrast: {mono_contrast}, brightness: {mono_brightness})")
-            
-            # Convert to JPEG bytes
-            buffer = BytesIO()
-            img.save(buffer, format='JPEG', quality=95)
-            image_bytes = buffer.getvalue()
-            
-            # Encode to base64
-            b64_string = base64.b64encode(image_bytes).decode('utf-8')
-            return b64_string
+        mtime_ns = os.stat(image_path).st_mtime_ns
+        return _encode_image_cached(image_path, mtime_ns, apply_monochrome,
+                                    mono_contrast, mono_brightness)
     except Exception as e:
         raise Exception(f"Failed to encode image {image_path}: {str(e)}")
 
@@ -120,7 +197,8 @@ def generate_training_image(
     is_monochrome: bool,
     monochrome_contrast: float,
     monochrome_brightness: float,
-    api_key: str
+    api_key: str,
+    log_prefix: str = ""
 ) -> dict:
     """
     Generate a single training image using img2img workflow.
@@ -135,15 +213,17 @@ def generate_training_image(
         prompt_frontpad: Front padding for prompt
         prompt_backpad: Back padding for prompt
         api_key: RunPod API key
+        log_prefix: Prefix for this image's log lines (e.g. "[3/20]")
     
     Returns:
         Dict with filename, success status, and result or error
     """
+    log = _PrefixAdapter(logger, {'prefix': log_prefix}) if log_prefix else logger
     filename = image_data.get('filename', '')
     fs_path = image_data.get('fs_path', '')
     
     try:
-        logger.info(f"Processing: {filename}")
+        log.info("Processing: %s", filename)
         
         # Encode image to base64 (with monochrome filter if applicable)
         base64_image = encode_image_to_base64(
@@ -152,20 +232,25 @@ def generate_training_image(
             mono_contrast=monochrome_contrast,
             mono_brightness=monochrome_brightness
         )
-        logger.info(f"  Image encoded: {len(base64_image)} bytes")
+        log.info("  Image encoded: %d bytes", len(base64_image))
         
         # Get caption if available
         caption = image_data.get('caption', '')
         if not caption:
-            logger.warning(f"  No caption available for {filename}")
+            log.warning("  No caption available for %s", filename)
             caption = "a movie scene"
         
         # Build full prompt with padding
         full_prompt = f"{prompt_frontpad}, {caption}, {prompt_backpad}".strip(', ')
-        logger.info(f"  Prompt: {full_prompt[:100]}...")
+        log.info("  Prompt: %.100s...", full_prompt)
         
-        # Clone workflow and update nodes
-        workflow_copy = json.loads(json.dumps(workflow))
+        # Clone only the nodes that get patched; all other nodes are shared
+        # with the template (nothing downstream mutates the payload)
+        workflow_copy = dict(workflow)
+        for node_id in PATCHED_NODE_IDS:
+            if node_id in workflow:
+                node = workflow[node_id]
+                workflow_copy[node_id] = {**node, 'inputs': dict(node.get('inputs', {}))}
         
         # Update source image (node 216)
         if '216' in workflow_copy:
@@ -205,7 +290,7 @@ def generate_training_image(
         }
         
         # Call RunPod serverless
-        logger.info(f"  Calling RunPod...")
+        log.info("  Calling RunPod...")
         result = generate_serverless_image(
             payload=payload,
             mode='150',
@@ -214,7 +299,7 @@ def generate_training_image(
         )
         
         if result and result.get('status') == 'COMPLETED':
-            logger.info(f"  ✅ SUCCESS: {filename}")
+            log.info("  ✅ SUCCESS: %s", filename)
             return {
                 'filename': filename,
                 'success': True,
@@ -222,7 +307,7 @@ def generate_training_image(
             }
         else:
             error_msg = result.get('error', 'Generation failed') if result else 'No result returned'
-            logger.error(f"  ❌ FAILED: {filename} - {error_msg}")
+            log.error("  ❌ FAILED: %s - %s", filename, error_msg)
             return {
                 'filename': filename,
                 'success': False,
@@ -230,7 +315,7 @@ def generate_training_image(
             }
     
     except Exception as e:
-        logger.error(f"  ❌ ERROR: {filename} - {str(e)}")
+        log.error("  ❌ ERROR: %s - %s", filename, e)
         return {
             'filename': filename,
             'success': False,
@@ -252,7 +337,7 @@ def main():
             sys.exit(1)
         
         # Read input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = fast_json.loads(sys.stdin.buffer.read())
         images = input_data.get('images', [])
         workflow = input_data.get('workflow', {})
         settings = input_data.get('settings', {})
@@ -293,34 +378,54 @@ def main():
             logger.info(f"🎲 Randomizing seed for each image (base seed: {base_seed})")
         logger.info(f"Settings: {settings}")
         
-        # Process each image
-        results = []
+        concurrency = max(1, int(input_data.get('concurrency', DEFAULT_CONCURRENCY)))
+        
+        # Work out each image's settings up front (seeds stay deterministic
+        # per index regardless of completion order)
+        jobs = []
         for i, img_data in enumerate(images, 1):
-            logger.info(f"[{i}/{len(images)}] Processing {img_data.get('filename', 'unknown')}")
-            
             # Use a random seed for each image if enabled
             current_settings = settings.copy()
             if randomize_seed_per_image:
-                import random
-                random.seed(base_seed + i)  # Deterministic random based on base seed + index
-                current_settings['seed'] = random.randint(0, 999999)
-                logger.info(f"  🎲 Using random seed: {current_settings['seed']}")
+                # Deterministic random based on base seed + index; a private
+                # generator leaves the global random state untouched
+                current_settings['seed'] = random.Random(base_seed + i).randint(0, 999999)
+                logger.info(f"[{i}/{len(images)}] 🎲 Using random seed: {current_settings['seed']}")
+            jobs.append((i, img_data, current_settings))
+        
+        # RunPod calls are network-bound, so run them on a thread pool;
+        # results are stored by index to keep the input order
+        results = [None] * len(images)
+        logger.info(f"Generating with up to {concurrency} concurrent requests")
+        with _queued_logging(), ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(
+                    generate_training_image,
+                    image_data=img_data,
+                    workflow=workflow,
+                    settings=current_settings,
+                    style_lora_name=style_lora_name,
+                    lora_strength_model=lora_strength_model,
+                    lora_strength_clip=lora_strength_clip,
+                    prompt_frontpad=prompt_frontpad,
+                    prompt_backpad=prompt_backpad,
+                    is_monochrome=is_monochrome,
+                    monochrome_contrast=monochrome_contrast,
+                    monochrome_brightness=monochrome_brightness,
+                    api_key=api_key,
+                    log_prefix=f"[{i}/{len(images)}]"
+                ): i
+                for i, img_data, current_settings in jobs
+            }
             
-            result = generate_training_image(
-                image_data=img_data,
-                workflow=workflow,
-                settings=current_settings,
-                style_lora_name=style_lora_name,
-                lora_strength_model=lora_strength_model,
-                lora_strength_clip=lora_strength_clip,
-                prompt_frontpad=prompt_frontpad,
-                prompt_backpad=prompt_backpad,
-                is_monochrome=is_monochrome,
-                monochrome_contrast=monochrome_contrast,
-                monochrome_brightness=monochrome_brightness,
-                api_key=api_key
-            )
-            results.append(result)
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                results[i - 1] = future.result()
+                logger.info("Progress: %d/%d finished", done, len(images))
+        
+        cache_info = _encode_image_cached.cache_info()
+        if cache_info.hits:
+            logger.info(f"Image encode cache: {cache_info.hits} hits, {cache_info.misses} misses")
         
         # Output results as JSON
         output = {
@@ -332,7 +437,10 @@ def main():
         }
         
         logger.info(f"Batch complete: {output['successful']} succeeded, {output['failed']} failed")
-        print(json.dumps(output))
+        sys.stdout.flush()
+        sys.stdout.buffer.write(fast_json.dumps(output))
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.flush()
         
     except json.JSONDecodeError as e:
         result = {
@@ -10,24 +10,28 @@ This script:
 5. Removes local base_image directories
 
 Usage:
-    python scripts/migrate_base_images_to_s3.py [--dry-run]
+    python scripts/migrate_base_images_to_s3.py [--dry-run] [--workers N]
 """
 
 import os
 import sys
-import json
 import shutil
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional
 from PIL import Image
 import io
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.utils.s3 import S3Client, S3Config
+from src.utils import fast_json
+from src.utils.s3 import IMAGE_CONTENT_TYPES, S3Client, S3Config
 
 # Setup logging
 logging.basicConfig(
@@ -36,19 +40,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Uploads already run in a worker pool; don't spawn transfer threads per upload
+UPLOAD_TRANSFER_CONFIG = TransferConfig(use_threads=False)
+
 
 class BaseImageMigrator:
     """Migrates base images to S3 and updates manifests."""
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, workers: int = 16, accelerate: bool = True):
         """
         Initialize migrator.
         
         Args:
             dry_run: If True, only simulate actions without making changes
+            workers: Number of actors migrated concurrently
+            accelerate: Upload through the S3 Transfer Acceleration endpoint
         """
         self.dry_run = dry_run
-        self.s3_client = S3Client()
+        self.workers = workers
+        # Base images are a few MB, so each one is a single PUT; the win is
+        # edge ingress via the accelerate endpoint plus kept-alive connections.
+        # One client is shared by all worker threads, so its connection pool
+        # must be at least as large as the worker count.
+        self.s3_client = S3Client(config=Config(
+            s3={'use_accelerate_endpoint': accelerate, 'addressing_style': 'virtual'},
+            tcp_keepalive=True,
+            max_pool_connections=max(workers, 10),
+            retries={'max_attempts': 5, 'mode': 'adaptive'}
+        ))
         self.bucket = "story-boards-assets"
         self.s3_prefix = "system_actors/base_images"
         
@@ -61,6 +80,16 @@ class BaseImageMigrator:
             'skipped': 0,
             'errors': 0
         }
+        # Actors are migrated on worker threads, so stats updates are locked
+        self._stats_lock = threading.Lock()
+        
+        # Parsed manifests keyed by numeric actor ID (filled by load_manifests)
+        self._manifests: Dict[str, Dict] = {}
+    
+    def _count(self, key: str) -> None:
+        """Increment a stats counter (thread-safe)."""
+        with self._stats_lock:
+            self.stats[key] += 1
     
     def find_all_actors(self) -> List[str]:
         """Find all actor directories."""
@@ -78,6 +107,26 @@ class BaseImageMigrator:
         logger.info(f"Found {len(actor_ids)} actors")
         return actor_ids
     
+    def load_manifests(self) -> None:
+        """Read and parse every actor manifest in one directory pass."""
+        manifests_dir = project_root / "data" / "actor_manifests"
+        
+        try:
+            entries = list(os.scandir(manifests_dir))
+        except FileNotFoundError:
+            logger.warning(f"Manifests directory not found: {manifests_dir}")
+            return
+        
+        for entry in entries:
+            if entry.name.endswith('_manifest.json') and entry.is_file():
+                numeric_id = entry.name.split('_')[0]
+                try:
+                    self._manifests[numeric_id] = fast_json.load_file(entry.path)
+                except ValueError as e:
+                    logger.warning(f"Skipping unreadable manifest {entry.name}: {e}")
+        
+        logger.info(f"Loaded {len(self._manifests)} manifests")
+    
     def find_base_image(self, actor_id: str) -> Optional[Path]:
         """
         Find base image for an actor.
@@ -90,23 +139,26 @@ class BaseImageMigrator:
         """
         base_image_dir = project_root / "data" / "actors" / actor_id / "base_image"
         
-        if not base_image_dir.exists():
+        # One directory read instead of a stat per candidate name
+        try:
+            with os.scandir(base_image_dir) as entries:
+                names = sorted(entry.name for entry in entries if entry.is_file())
+        except (FileNotFoundError, NotADirectoryError):
             return None
         
         # Look for base image files
         for ext in ['png', 'jpg', 'jpeg', 'webp']:
-            base_image_path = base_image_dir / f"{actor_id}_base.{ext}"
-            if base_image_path.exists():
-                return base_image_path
+            if f"{actor_id}_base.{ext}" in names:
+                return base_image_dir / f"{actor_id}_base.{ext}"
         
         # Look for any image file in the directory
-        for image_file in base_image_dir.glob("*"):
-            if image_file.suffix.lower() in ['.png', '.jpg', '.jpeg', '.webp']:
-                return image_file
+        for name in names:
+            if os.path.splitext(name)[1].lower() in ['.png', '.jpg', '.jpeg', '.webp']:
+                return base_image_dir / name
         
         return None
     
-    def convert_to_jpeg(self, image_path: Path) -> bytes:
+    def convert_to_jpeg(self, image_path: Path) -> io.BytesIO:
         """
         Convert image to JPEG format.
         
@@ -114,39 +166,49 @@ class BaseImageMigrator:
             image_path: Path to source image
             
         Returns:
-            JPEG image bytes
+            Buffer holding the JPEG image, positioned at the start
         """
         logger.info(f"  Converting {image_path.name} to JPEG...")
         
-        # Open image
-        img = Image.open(image_path)
-        
-        # Convert RGBA to RGB if needed
-        if img.mode in ('RGBA', 'LA', 'P'):
-            # Create white background
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-        
-        # Save to bytes buffer
         buffer = io.BytesIO()
-        img.save(buffer, format='JPEG', quality=95, optimize=True)
-        jpeg_bytes = buffer.getvalue()
         
-        logger.info(f"  Converted to JPEG: {len(jpeg_bytes) / 1024 / 1024:.2f} MB")
-        return jpeg_bytes
+        # Open image (closed as soon as the JPEG has been written)
+        with Image.open(image_path) as img:
+            # Already an upright RGB JPEG: upload the original bytes instead of
+            # re-encoding (a non-default EXIF Orientation would rotate it on display)
+            if (img.format == 'JPEG' and img.mode == 'RGB'
+                    and img.getexif().get(0x0112, 1) == 1):
+                buffer.write(image_path.read_bytes())
+                buffer.seek(0)
+                logger.info(f"  Already JPEG, using original: {buffer.getbuffer().nbytes / 1024 / 1024:.2f} MB")
+                return buffer
+            
+            # Convert RGBA to RGB if needed
+            if img.mode in ('RGBA', 'LA', 'P'):
+                # Create white background
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                if img.mode == 'P':
+                    img = img.convert('RGBA')
+                background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+                img = background
+            elif img.mode != 'RGB':
+                img = img.convert('RGB')
+            
+            # Save to bytes buffer (no optimize=True: the second Huffman pass
+            # roughly doubles encode time for a ~1-3% smaller file)
+            img.save(buffer, format='JPEG', quality=95)
+        
+        buffer.seek(0)
+        logger.info(f"  Converted to JPEG: {buffer.getbuffer().nbytes / 1024 / 1024:.2f} MB")
+        return buffer
     
-    def upload_to_s3(self, actor_id: str, jpeg_bytes: bytes) -> str:
+    def upload_to_s3(self, actor_id: str, jpeg_buffer: io.BytesIO) -> str:
         """
         Upload JPEG to S3.
         
         Args:
             actor_id: Actor ID
-            jpeg_bytes: JPEG image bytes
+            jpeg_buffer: Buffer holding the JPEG image
             
         Returns:
             S3 URL
@@ -160,11 +222,13 @@ class BaseImageMigrator:
             return f"https://{self.bucket}.s3-accelerate.amazonaws.com/{s3_key}"
         
         # Upload to S3
-        result = self.s3_client.upload_image(
-            image_data=jpeg_bytes,
+        # Stream the buffer instead of handing boto3 another copy of the bytes
+        result = self.s3_client.upload_fileobj(
+            fileobj=jpeg_buffer,
             bucket=self.bucket,
             key=s3_key,
-            extension='jpg'
+            content_type=IMAGE_CONTENT_TYPES['jpg'],
+            transfer_config=UPLOAD_TRANSFER_CONFIG
         )
         
         s3_url = result['Location']
@@ -187,7 +251,8 @@ class BaseImageMigrator:
         numeric_id = actor_id.split('_')[0]
         manifest_path = project_root / "data" / "actor_manifests" / f"{numeric_id}_manifest.json"
         
-        if not manifest_path.exists():
+        manifest = self._manifests.get(numeric_id)
+        if manifest is None:
             logger.warning(f"  Manifest not found: {manifest_path}")
             return False
         
@@ -197,10 +262,6 @@ class BaseImageMigrator:
             logger.info("  [DRY RUN] Would update manifest")
             return True
         
-        # Read manifest
-        with open(manifest_path, 'r') as f:
-            manifest = json.load(f)
-        
         # Update base_images section
         manifest['base_images'] = [{
             'filename': f"{actor_id}_base.jpg",
@@ -214,9 +275,10 @@ class BaseImageMigrator:
             manifest['statistics'] = {}
         manifest['statistics']['base_images_count'] = 1
         
-        # Write updated manifest
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        # Write updated manifest now rather than at the end of the run: the
+        # local base image is deleted right after, so the S3 URL must be on disk.
+        # The write is atomic so an interrupted run never leaves a torn manifest.
+        fast_json.dump_file(manifest, manifest_path, indent=True, atomic=True)
         
         logger.info(f"  ✓ Manifest updated")
         return True
@@ -270,33 +332,33 @@ class BaseImageMigrator:
             
             if not base_image_path:
                 logger.warning(f"  No base image found for {actor_id}")
-                self.stats['skipped'] += 1
+                self._count('skipped')
                 return False
             
             logger.info(f"  Found base image: {base_image_path}")
             
             # Convert to JPEG
-            jpeg_bytes = self.convert_to_jpeg(base_image_path)
-            self.stats['converted'] += 1
+            jpeg_buffer = self.convert_to_jpeg(base_image_path)
+            self._count('converted')
             
             # Upload to S3
-            s3_url = self.upload_to_s3(actor_id, jpeg_bytes)
-            self.stats['uploaded'] += 1
+            s3_url = self.upload_to_s3(actor_id, jpeg_buffer)
+            self._count('uploaded')
             
             # Update manifest
             if self.update_manifest(actor_id, s3_url):
-                self.stats['manifests_updated'] += 1
+                self._count('manifests_updated')
             
             # Delete local files
             if self.delete_local_base_image(actor_id):
-                self.stats['local_deleted'] += 1
+                self._count('local_deleted')
             
             logger.info(f"  ✓ Successfully migrated {actor_id}")
             return True
             
         except Exception as e:
             logger.error(f"  ✗ Error migrating {actor_id}: {e}", exc_info=True)
-            self.stats['errors'] += 1
+            self._count('errors')
             return False
     
     def migrate_all(self) -> Dict:
@@ -317,17 +379,20 @@ class BaseImageMigrator:
         logger.info(f"S3 Prefix: {self.s3_prefix}")
         logger.info("")
         
-        # Find all actors
+        # Find all actors and preload their manifests
         actor_ids = self.find_all_actors()
+        self.load_manifests()
         self.stats['total_actors'] = len(actor_ids)
         
         if not actor_ids:
             logger.error("No actors found!")
             return self.stats
         
-        # Migrate each actor
-        for actor_id in actor_ids:
-            self.migrate_actor(actor_id)
+        # Migrate actors concurrently; each one is dominated by S3 upload latency
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.migrate_actor, actor_id) for actor_id in actor_ids]
+            for done, _ in enumerate(as_completed(futures), 1):
+                logger.info(f"Progress: {done}/{len(actor_ids)} actors processed")
         
         # Print summary
         self.print_summary()
@@ -374,11 +439,26 @@ Examples:
         action='store_true',
         help='Preview changes without making them'
     )
+    parser.add_argument(
+        '--no-accelerate',
+        action='store_true',
+        help='Upload via the regional S3 endpoint instead of Transfer Acceleration'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=16,
+        help='Number of actors to migrate concurrently (default: 16)'
+    )
     
     args = parser.parse_args()
     
     # Create migrator and run
-    migrator = BaseImageMigrator(dry_run=args.dry_run)
+    migrator = BaseImageMigrator(
+        dry_run=args.dry_run,
+        workers=args.workers,
+        accelerate=not args.no_accelerate
+    )
     stats = migrator.migrate_all()
     
     # Exit with error code if there were errors
@@ -14,25 +14,142 @@ This script:
 """
 
 import os
-import json
+import errno
 import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
 import hashlib
+import itertools
+import mmap
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import fast_json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Read size used when hashing files
+HASH_CHUNK_SIZE = 1 << 20
+
+# Files up to this size are hashed through a single mmap instead of chunked reads
+HASH_MMAP_MAX_SIZE = 512 * 1024 * 1024
+
+# Suffixes of scene/post frame images picked up from the source images directory
+SCENE_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.webp', '.avif', '.gif'})
+
+
+def calculate_file_hash(file_path: Path) -> str:
+    """
+    Calculate MD5 hash of a file.
+    
+    MD5 is kept (rather than a faster non-cryptographic hash) because
+    md5_hash is compared against S3 ETags downstream; it is only used for
+    change detection, hence usedforsecurity=False. Module-level so it can
+    run in a ProcessPoolExecutor.
+    """
+    hash_md5 = hashlib.md5(usedforsecurity=False)
+    
+    with open(file_path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        
+        # Typical images fit comfortably in one mapping: hash them in a
+        # single update() with no Python-level chunk loop
+        if 0 < size <= HASH_MMAP_MAX_SIZE:
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                hash_md5.update(mm)
+            return hash_md5.hexdigest()
+        
+        # Unbuffered reads into one reusable 1 MiB buffer: far fewer read()
+        # calls and loop iterations than 4 KiB chunks, and no per-chunk bytes
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        buffer = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            hash_md5.update(view[:n])
+    return hash_md5.hexdigest()
+
+
+def copy_file_kernel(source: Path, target: Union[str, Path], stat: Optional[os.stat_result] = None) -> None:
+    """
+    Copy a file with in-kernel copies, preserving its mode and timestamps.
+    
+    Uses copy_file_range (which can reflink on Btrfs/XFS), then sendfile,
+    and only falls back to shutil.copyfile where neither works.
+    
+    Args:
+        source: Source file path
+        target: Target file path
+        stat: Precomputed stat result of source
+    """
+    if stat is None:
+        stat = os.stat(source)
+    
+    src_fd = os.open(source, os.O_RDONLY)
+    try:
+        dst_fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, stat.st_mode & 0o7777)
+        try:
+            copied = 0
+            for copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+                if copy is None:
+                    continue
+                try:
+                    while copied < stat.st_size:
+                        if copy is os.sendfile:
+                            n = copy(dst_fd, src_fd, copied, stat.st_size - copied)
+                        else:
+                            n = copy(src_fd, dst_fd, stat.st_size - copied, copied, copied)
+                        if not n:
+                            break
+                        copied += n
+                    break
+                except OSError as e:
+                    # Unsupported for this pair of files (old kernel, macOS
+                    # sendfile to a regular file, ...): try the next method
+                    if copied or e.errno not in (errno.ENOSYS, errno.EXDEV, errno.EINVAL,
+                                                 errno.EOPNOTSUPP, errno.ENOTSOCK):
+                        raise
+            else:
+                copied = -1
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    
+    if copied < 0:
+        shutil.copyfile(source, target)
+    
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
 
 
 class CharacterMigrator:
-    def __init__(self, source_root: str, target_root: str):
+    def __init__(self, source_root: str, target_root: str, hash_files: bool = True):
         """
         Initialize the migrator.
         
         Args:
             source_root: Path to wm-characters directory
             target_root: Path to actor_maker directory
+            hash_files: Record an md5_hash per file (read by the UI and compared
+                against S3 ETags); disable only for quick inventory runs
         """
         self.source_root = Path(source_root)
         self.target_root = Path(target_root)
+        self.hash_files = hash_files
+        
+        # Root prefixes (with trailing separator) for cheap relative paths
+        self._source_prefix = os.path.join(os.fspath(self.source_root), '')
+        self._target_prefix = os.path.join(os.fspath(self.target_root), '')
         
         # Source paths
         self.source_characters_dir = self.source_root / "characters"
@@ -49,85 +166,162 @@ class CharacterMigrator:
         self.target_scenes_dir.mkdir(parents=True, exist_ok=True)
         self.target_manifests_dir.mkdir(parents=True, exist_ok=True)
         
-        # Load characters metadata
-        self.characters = self._load_characters()
+        # Process pool for hashing (set while migrate_all_characters runs)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        
+        # Target directories already created during this run
+        self._created_dirs = set()
+        
+        # Character directories keyed by full name and by ID prefix (built on first lookup)
+        self._char_dir_index: Optional[Dict[str, Path]] = None
         
-    def _load_characters(self) -> List[Dict[str, Any]]:
-        """Load characters.json from source."""
+        # Scene image entries keyed by gender subdirectory (built on first lookup)
+        self._scene_index: Optional[Dict[str, List[os.DirEntry]]] = None
+        
+    def _load_characters(self) -> Iterator[Dict[str, Any]]:
+        """
+        Load characters.json from source.
+        
+        With ijson installed, characters are parsed one at a time as the
+        migration consumes them instead of materializing the whole array.
+        """
         if not self.source_characters_json.exists():
             print(f"Error: {self.source_characters_json} not found")
-            return []
+            return
         
-        with open(self.source_characters_json, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(self.source_characters_json, 'rb') as f:
+            if ijson is not None:
+                yield from ijson.items(f, 'item', use_float=True)
+            else:
+                yield from fast_json.loads(f.read())
     
-    def _get_file_metadata(self, file_path: Path) -> Dict[str, Any]:
+    @staticmethod
+    def _relative_path(path: Union[str, Path], root_prefix: str, root: Path) -> str:
+        """
+        Path relative to root, by slicing off the root prefix.
+        
+        Falls back to Path.relative_to for paths not spelled under the prefix.
+        """
+        path_str = os.fspath(path)
+        if path_str.startswith(root_prefix):
+            return path_str[len(root_prefix):]
+        return str(Path(path_str).relative_to(root))
+    
+    def _get_file_metadata(self, file_path: Path, file_hash: Optional[str] = None,
+                           stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
         """
         Get metadata for a file.
         
         Args:
             file_path: Path to the file
+            file_hash: Precomputed MD5 hash (calculated here if omitted)
+            stat: Precomputed stat result (e.g. from a DirEntry)
             
         Returns:
-            Dictionary with file metadata
+            Dictionary with file metadata (without md5_hash when hashing is disabled)
         """
-        if not file_path.exists():
-            return None
-        
-        stat = file_path.stat()
+        if stat is None:
+            if not file_path.exists():
+                return None
+            stat = file_path.stat()
         
         # Calculate file hash
-        file_hash = self._calculate_file_hash(file_path)
+        if file_hash is None and self.hash_files:
+            file_hash = self._calculate_file_hash(file_path)
+        
+        # The UI reads the ISO dates, so they stay; files that were never
+        # modified after creation share one formatted string
+        created_date = datetime.fromtimestamp(stat.st_birthtime).isoformat()
+        if stat.st_mtime == stat.st_birthtime:
+            modified_date = created_date
+        else:
+            modified_date = datetime.fromtimestamp(stat.st_mtime).isoformat()
         
-        return {
+        metadata = {
             "path": str(file_path),
-            "relative_path": str(file_path.relative_to(self.source_root)),
+            "relative_path": self._relative_path(file_path, self._source_prefix, self.source_root),
             "size_bytes": stat.st_size,
             "size_mb": round(stat.st_size / (1024 * 1024), 2),
             "created_timestamp": stat.st_birthtime,
-            "created_date": datetime.fromtimestamp(stat.st_birthtime).isoformat(),
+            "created_date": created_date,
             "modified_timestamp": stat.st_mtime,
-            "modified_date": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-            "md5_hash": file_hash
+            "modified_date": modified_date
         }
+        if self.hash_files:
+            metadata["md5_hash"] = file_hash
+        
+        return metadata
     
     def _calculate_file_hash(self, file_path: Path) -> str:
         """Calculate MD5 hash of a file."""
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        return calculate_file_hash(file_path)
+    
+    def _hash_files(self, paths: List[Path]) -> Dict[Path, str]:
+        """
+        Hash several files, across worker processes when a pool is running.
+        
+        Args:
+            paths: Files to hash
+            
+        Returns:
+            Mapping of path to MD5 hex digest (empty when hashing is disabled)
+        """
+        if not self.hash_files:
+            return {}
+        
+        if self._executor is None or len(paths) < 2:
+            return {path: calculate_file_hash(path) for path in paths}
+        
+        digests = self._executor.map(calculate_file_hash, paths, chunksize=32)
+        return dict(zip(paths, digests))
     
-    def _move_file_with_metadata(self, source: Path, target: Path) -> Dict[str, Any]:
+    def _move_file_with_metadata(self, source: Path, target: Union[str, Path],
+                                 file_hash: Optional[str] = None,
+                                 stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
         """
         Move a file and return its metadata.
         
         Args:
             source: Source file path
             target: Target file path
+            file_hash: Precomputed MD5 hash of source (calculated if omitted)
+            stat: Precomputed stat result of source
             
         Returns:
             Metadata dictionary for the moved file
         """
         # Get metadata before moving
-        metadata = self._get_file_metadata(source)
+        metadata = self._get_file_metadata(source, file_hash, stat)
         
         if metadata is None:
             return None
         
         # Create target directory if needed
-        target.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Move file
-        shutil.move(str(source), str(target))
+        self._ensure_directory(os.path.dirname(target))
+        
+        # Move file: a rename on the same filesystem (no data copied); only a
+        # cross-device move falls back to copy + delete
+        try:
+            os.replace(source, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            copy_file_kernel(source, target, stat)
+            os.unlink(source)
         
         # Update metadata with new path
-        metadata["moved_to"] = str(target)
-        metadata["moved_relative_path"] = str(target.relative_to(self.target_root))
+        metadata["moved_to"] = os.fspath(target)
+        metadata["moved_relative_path"] = self._relative_path(target, self._target_prefix, self.target_root)
         
         return metadata
     
+    def _ensure_directory(self, directory: Union[str, Path]) -> None:
+        """Create a target directory once per run."""
+        directory = os.fspath(directory)
+        if directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+    
     def _find_character_directory(self, character_id: str, character_name: str) -> Optional[Path]:
         """
         Find the character directory in wm-characters.
@@ -139,48 +333,115 @@ class CharacterMigrator:
         Returns:
             Path to character directory or None
         """
-        # Try exact match first
-        char_dir = self.source_characters_dir / character_name
-        if char_dir.exists():
-            return char_dir
+        if self._char_dir_index is None:
+            self._char_dir_index = self._index_character_directories()
         
-        # Try with ID prefix
-        for item in self.source_characters_dir.iterdir():
-            if item.is_dir() and item.name.startswith(f"{character_id}_"):
-                return item
+        # Exact name match first, then ID prefix
+        return self._char_dir_index.get(character_name) or self._char_dir_index.get(f"{character_id}_")
+    
+    def _index_character_directories(self) -> Dict[str, Path]:
+        """
+        Index the source character directories with a single scandir pass.
         
-        return None
+        Returns:
+            Dictionary mapping each directory name, and each "<id>_" prefix
+            (first directory in listing order wins), to its path
+        """
+        index = {}
+        
+        if not self.source_characters_dir.is_dir():
+            return index
+        
+        with os.scandir(self.source_characters_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                path = Path(entry.path)
+                index[entry.name] = path
+                character_id, sep, _ = entry.name.partition('_')
+                if sep:
+                    index.setdefault(f"{character_id}_", path)
+        
+        return index
     
-    def _get_scene_images_for_character(self, character_id: str, gender: str) -> List[Path]:
+    def _list_files(self, directory: Path, extensions: Optional[frozenset] = None) -> List[os.DirEntry]:
+        """
+        List the regular files in a directory.
+        
+        Uses os.scandir so file types come from the directory listing and each
+        entry's stat() result is cached for the metadata step.
+        
+        Args:
+            directory: Directory to list
+            extensions: Optional set of lowercase suffixes (e.g. ".jpg") to keep
+            
+        Returns:
+            List of directory entries (empty if the directory does not exist)
+        """
+        try:
+            with os.scandir(directory) as entries:
+                if extensions is None:
+                    return [entry for entry in entries if entry.is_file()]
+                
+                files = []
+                for entry in entries:
+                    # Lowercase only the short suffix; dot > 0 skips dotfiles
+                    # like ".jpg", matching os.path.splitext
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if dot > 0 and name[dot:].lower() in extensions and entry.is_file():
+                        files.append(entry)
+                return files
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+    
+    def _get_scene_images_for_character(self, character_id: str, gender: str,
+                                        consume: bool = False) -> List[os.DirEntry]:
         """
         Find all scene images that could be used for this character.
         
         Args:
             character_id: Character ID
             gender: Character gender (male/female)
+            consume: Drop the returned entries from the index (they are about
+                to be moved, so later characters must not see them)
             
         Returns:
-            List of image file paths
+            List of image file entries
         """
-        scene_images = []
+        if self._scene_index is None:
+            self._scene_index = self._index_scene_images()
         
-        if not self.source_images_dir.exists():
-            return scene_images
+        if consume:
+            return self._scene_index.pop(gender, [])
+        return list(self._scene_index.get(gender, ()))
+    
+    def _index_scene_images(self) -> Dict[str, List[os.DirEntry]]:
+        """
+        Group every scene image by its gender subdirectory in a single walk.
         
-        # Walk through all scene directories
-        for scene_dir in self.source_images_dir.iterdir():
-            if not scene_dir.is_dir():
-                continue
-            
-            # Look for gender-specific subdirectory
-            gender_dir = scene_dir / gender
-            if gender_dir.exists() and gender_dir.is_dir():
-                # Get all image files
-                for img_file in gender_dir.iterdir():
-                    if img_file.is_file() and img_file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.webp', '.avif', '.gif']:
-                        scene_images.append(img_file)
-        
-        return scene_images
+        Returns:
+            Dictionary mapping gender directory name to image file entries,
+            in scene directory listing order
+        """
+        index: Dict[str, List[os.DirEntry]] = {}
+        
+        try:
+            with os.scandir(self.source_images_dir) as entries:
+                scene_dirs = [entry.path for entry in entries if entry.is_dir()]
+        except FileNotFoundError:
+            return index
+        
+        # Walk through all scene directories and their gender-specific subdirectories
+        for scene_dir in scene_dirs:
+            with os.scandir(scene_dir) as entries:
+                gender_dirs = [entry for entry in entries if entry.is_dir()]
+            for gender_dir in gender_dirs:
+                index.setdefault(gender_dir.name, []).extend(
+                    self._list_files(gender_dir.path, SCENE_IMAGE_EXTENSIONS)
+                )
+        
+        return index
     
     def migrate_character(self, character: Dict[str, Any], move_files: bool = True) -> Dict[str, Any]:
         """
@@ -214,6 +475,7 @@ class CharacterMigrator:
                 "scene_images_count": 0
             }
         }
+        statistics = manifest["statistics"]
         
         # Find character directory
         char_dir = self._find_character_directory(character_id, character_name)
@@ -223,96 +485,142 @@ class CharacterMigrator:
             manifest["status"] = "character_directory_not_found"
             return manifest
         
-        # Process base images
+        # Collect base images
+        base_images = []
         base_image_dir = char_dir / "base_image"
         if base_image_dir.exists():
-            for img_file in base_image_dir.iterdir():
-                if img_file.is_file():
-                    # Target path
-                    target_path = self.target_actors_dir / character_name / "base_image" / img_file.name
-                    
-                    # Move file and get metadata
-                    if move_files:
-                        file_metadata = self._move_file_with_metadata(img_file, target_path)
-                    else:
-                        file_metadata = self._get_file_metadata(img_file)
-                        file_metadata["would_move_to"] = str(target_path)
-                    
-                    if file_metadata:
-                        manifest["base_images"].append(file_metadata)
-                        manifest["statistics"]["base_images_count"] += 1
-                        manifest["statistics"]["total_size_bytes"] += file_metadata["size_bytes"]
+            base_images = self._list_files(base_image_dir)
         else:
             print(f"  Warning: No base_image directory found")
         
-        # Process scene images
-        scene_images = self._get_scene_images_for_character(character_id, gender)
+        # Collect scene images
+        scene_images = self._get_scene_images_for_character(character_id, gender, consume=move_files)
         print(f"  Found {len(scene_images)} potential scene images for {gender}")
         
-        for scene_img in scene_images:
+        # Hash everything up front (in parallel when a pool is running); the
+        # moves and manifest assembly below stay sequential
+        hashes = self._hash_files([Path(entry.path) for entry in base_images + scene_images])
+        
+        # Target paths are joined as strings: the directory once per character
+        # (or scene), then one os.path.join per file
+        base_target_dir = os.path.join(self.target_actors_dir, character_name, "base_image")
+        scene_target_dirs = {}
+        
+        # Process base images
+        for entry in base_images:
+            img_file = Path(entry.path)
+            
+            # Target path
+            target_path = os.path.join(base_target_dir, entry.name)
+            
+            # Move file and get metadata
+            if move_files:
+                file_metadata = self._move_file_with_metadata(img_file, target_path, hashes.get(img_file), entry.stat())
+            else:
+                file_metadata = self._get_file_metadata(img_file, hashes.get(img_file), entry.stat())
+                file_metadata["would_move_to"] = target_path
+            
+            if file_metadata:
+                manifest["base_images"].append(file_metadata)
+                statistics["base_images_count"] += 1
+                statistics["total_size_bytes"] += file_metadata["size_bytes"]
+        
+        # Process scene images
+        for entry in scene_images:
+            scene_img = Path(entry.path)
+            
             # Extract scene name from path
             scene_name = scene_img.parent.parent.name  # e.g., "41 firefighter"
             
             # Target path
-            target_path = self.target_scenes_dir / scene_name / gender / scene_img.name
+            scene_target_dir = scene_target_dirs.get(scene_name)
+            if scene_target_dir is None:
+                scene_target_dir = scene_target_dirs[scene_name] = os.path.join(
+                    self.target_scenes_dir, scene_name, gender
+                )
+            target_path = os.path.join(scene_target_dir, entry.name)
             
             # Move file and get metadata
             if move_files:
-                file_metadata = self._move_file_with_metadata(scene_img, target_path)
+                file_metadata = self._move_file_with_metadata(scene_img, target_path, hashes.get(scene_img), entry.stat())
             else:
-                file_metadata = self._get_file_metadata(scene_img)
-                file_metadata["would_move_to"] = str(target_path)
+                file_metadata = self._get_file_metadata(scene_img, hashes.get(scene_img), entry.stat())
+                file_metadata["would_move_to"] = target_path
             
             if file_metadata:
                 file_metadata["scene_name"] = scene_name
                 manifest["scene_images"].append(file_metadata)
-                manifest["statistics"]["scene_images_count"] += 1
-                manifest["statistics"]["total_size_bytes"] += file_metadata["size_bytes"]
+                statistics["scene_images_count"] += 1
+                statistics["total_size_bytes"] += file_metadata["size_bytes"]
         
         # Calculate totals
-        manifest["statistics"]["total_files"] = (
-            manifest["statistics"]["base_images_count"] + 
-            manifest["statistics"]["scene_images_count"]
+        statistics["total_files"] = (
+            statistics["base_images_count"] + 
+            statistics["scene_images_count"]
         )
-        manifest["statistics"]["total_size_mb"] = round(
-            manifest["statistics"]["total_size_bytes"] / (1024 * 1024), 2
+        statistics["total_size_mb"] = round(
+            statistics["total_size_bytes"] / (1024 * 1024), 2
         )
         
         manifest["status"] = "success"
         
         return manifest
     
-    def migrate_all_characters(self, move_files: bool = True, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def migrate_all_characters(self, move_files: bool = True, limit: Optional[int] = None,
+                               workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Migrate all characters.
         
         Args:
             move_files: Whether to actually move files (False for dry run)
             limit: Optional limit on number of characters to process
+            workers: Number of hashing processes (defaults to the CPU count)
             
         Returns:
             List of manifest dictionaries
         """
         manifests = []
-        characters_to_process = self.characters[:limit] if limit else self.characters
+        summary_characters = []
+        total_files = 0
+        total_size_mb = 0
+        characters_to_process = itertools.islice(self._load_characters(), limit or None)
         
-        print(f"Starting migration of {len(characters_to_process)} characters")
+        print(f"Starting migration of {f'up to {limit}' if limit else 'all'} characters")
         print(f"Move files: {move_files}")
         print(f"Source: {self.source_root}")
         print(f"Target: {self.target_root}")
         
-        for idx, character in enumerate(characters_to_process):
-            manifest = self.migrate_character(character, move_files=move_files)
-            manifests.append(manifest)
-            
-            # Save individual manifest
-            character_id = character.get('id', f'char_{idx}')
-            manifest_file = self.target_manifests_dir / f"{character_id}_manifest.json"
-            
-            with open(manifest_file, 'w', encoding='utf-8') as f:
-                json.dump(manifest, f, indent=2, ensure_ascii=False)
-            
-            print(f"  Manifest saved: {manifest_file}")
+        # Hashing is CPU-bound, so spread it over worker processes for the run
+        if self.hash_files:
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            for idx, character in enumerate(characters_to_process):
+                manifest = self.migrate_character(character, move_files=move_files)
+                manifests.append(manifest)
+                
+                # Keep the summary totals running instead of re-walking the manifests
+                stats = manifest["statistics"]
+                total_files += stats["total_files"]
+                total_size_mb += stats["total_size_mb"]
+                summary_characters.append({
+                    "id": manifest["character_id"],
+                    "name": manifest["character_name"],
+                    "status": manifest["status"],
+                    "files": stats["total_files"],
+                    "size_mb": stats["total_size_mb"]
+                })
+                
+                # Save individual manifest
+                character_id = character.get('id', f'char_{idx}')
+                manifest_file = self.target_manifests_dir / f"{character_id}_manifest.json"
+                
+                fast_json.dump_file(manifest, manifest_file, indent=True)
+                
+                print(f"  Manifest saved: {manifest_file}")
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
         
         # Save summary manifest
         summary = {
@@ -320,23 +628,13 @@ class CharacterMigrator:
             "source_directory": str(self.source_root),
             "target_directory": str(self.target_root),
             "total_characters": len(manifests),
-            "total_files": sum(m["statistics"]["total_files"] for m in manifests),
-            "total_size_mb": sum(m["statistics"]["total_size_mb"] for m in manifests),
-            "characters": [
-                {
-                    "id": m["character_id"],
-                    "name": m["character_name"],
-                    "status": m["status"],
-                    "files": m["statistics"]["total_files"],
-                    "size_mb": m["statistics"]["total_size_mb"]
-                }
-                for m in manifests
-            ]
+            "total_files": total_files,
+            "total_size_mb": total_size_mb,
+            "characters": summary_characters
         }
         
         summary_file = self.target_manifests_dir / "_migration_summary.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        fast_json.dump_file(summary, summary_file, indent=True)
         
         print(f"\n{'='*60}")
         print(f"Migration complete!")
@@ -364,15 +662,20 @@ def main():
                        help='Generate manifests without moving files')
     parser.add_argument('--limit', type=int, default=None,
                        help='Limit number of characters to process (for testing)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Number of processes used for file hashing (default: CPU count)')
+    parser.add_argument('--no-hash', action='store_true',
+                       help='Skip MD5 hashing and omit md5_hash from manifests (inventory runs only)')
     
     args = parser.parse_args()
     
     # Initialize migrator
-    migrator = CharacterMigrator(args.source, args.target)
+    migrator = CharacterMigrator(args.source, args.target, hash_files=not args.no_hash)
     
     # Run migration
     move_files = not args.dry_run
-    manifests = migrator.migrate_all_characters(move_files=move_files, limit=args.limit)
+    manifests = migrator.migrate_all_characters(move_files=move_files, limit=args.limit,
+                                               workers=args.workers)
     
     print(f"\nProcessed {len(manifests)} characters")
 
@@ -13,36 +13,104 @@ Usage:
     python3 scripts/migrate_manifests_from_s3.py [--dry-run] [--actor-id ACTOR_ID]
 """
 
-import json
 import os
 import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import shutil
 import argparse
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.training_data_sync import TrainingDataSync
+from src.utils import fast_json
 from src.training_data_manifest import TrainingDataManifest
 
 MANIFEST_DIR = project_root / "data" / "actor_manifests"
 BACKUP_DIR = project_root / "data" / "manifest_backups"
 
+# Keeps each manifest's log lines together when migrating in parallel
+_print_lock = threading.Lock()
+
+# One TrainingDataSync (and so one boto3 client, which is thread-safe) shared by all migrations
+_sync: Optional[TrainingDataSync] = None
+_sync_lock = threading.Lock()
+
+# zstd level for compressed backups (fast, and JSON still shrinks several times over)
+BACKUP_ZSTD_LEVEL = 3
+
+# Linux ioctl that makes the destination share the source's extents (Btrfs/XFS reflink)
+FICLONE = 0x40049409
+
 
 def backup_manifest(manifest_path: Path) -> Path:
-    """Create a backup of the manifest file."""
+    """
+    Create a backup of the manifest file.
+    
+    With zstandard installed the backup is a compressed <name>.json.zst
+    (restore with `zstd -d`); otherwise it is a plain .json copy.
+    """
     BACKUP_DIR.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_name = f"{manifest_path.stem}_{timestamp}.json"
+    
+    if zstandard is not None:
+        backup_path = BACKUP_DIR / f"{backup_name}.zst"
+        compressor = zstandard.ZstdCompressor(level=BACKUP_ZSTD_LEVEL)
+        backup_path.write_bytes(compressor.compress(manifest_path.read_bytes()))
+        shutil.copystat(manifest_path, backup_path)
+        return backup_path
+    
     backup_path = BACKUP_DIR / backup_name
-    shutil.copy2(manifest_path, backup_path)
+    
+    # A hard link would not do: manifests are rewritten in place, which would
+    # change the "backup" too. A reflink is an independent copy-on-write file
+    # that costs no data copy; other filesystems get a regular copy.
+    if not _reflink_copy(manifest_path, backup_path):
+        shutil.copy2(manifest_path, backup_path)
     return backup_path
 
 
+def _reflink_copy(source: Path, target: Path) -> bool:
+    """Clone source to target with FICLONE; returns False where unsupported."""
+    if fcntl is None:
+        return False
+    
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            return False
+    
+    shutil.copystat(source, target)
+    return True
+
+
+def _get_sync() -> TrainingDataSync:
+    """Return the shared TrainingDataSync, creating it on first use."""
+    global _sync
+    if _sync is None:
+        with _sync_lock:
+            if _sync is None:
+                _sync = TrainingDataSync()
+    return _sync
+
+
 def migrate_manifest(manifest_path: Path, dry_run: bool = False) -> Dict[str, Any]:
     """
     Migrate a single manifest by populating training_data from S3.
@@ -61,10 +129,13 @@ def migrate_manifest(manifest_path: Path, dry_run: bool = False) -> Dict[str, An
         "skipped": False
     }
     
+    # Output is buffered per manifest and printed in one block, so parallel
+    # migrations don't interleave their lines
+    out = []
+    
     try:
         # Load manifest
-        with open(manifest_path, 'r') as f:
-            manifest = json.load(f)
+        manifest = fast_json.load_file(manifest_path)
         
         actor_name = manifest.get("character_name")
         stats["actor_name"] = actor_name
@@ -78,43 +149,49 @@ def migrate_manifest(manifest_path: Path, dry_run: bool = False) -> Dict[str, An
             stats["images_added"] = len(training_data)
             return stats
         
-        print(f"\n[{stats['actor_id']}] Processing {actor_name}...")
-        print(f"  Current training_data entries: {len(training_data)}")
+        out.append(f"\n[{stats['actor_id']}] Processing {actor_name}...")
+        out.append(f"  Current training_data entries: {len(training_data)}")
         
         if dry_run:
-            print(f"  [DRY RUN] Would scan S3 and populate manifest")
+            out.append(f"  [DRY RUN] Would scan S3 and populate manifest")
             return stats
         
         # Create backup before modifying
         backup_path = backup_manifest(manifest_path)
         stats["backup_created"] = True
-        print(f"  ✓ Backup created: {backup_path.name}")
+        out.append(f"  ✓ Backup created: {backup_path.name}")
         
         # Use TrainingDataSync to auto-initialize from S3
-        print(f"  Scanning S3 for training images...")
-        sync = TrainingDataSync()
+        out.append(f"  Scanning S3 for training images...")
+        sync = _get_sync()
         result = sync.auto_initialize_manifest(actor_name)
         
         stats["images_found_in_s3"] = result.get("images_found", 0)
         stats["images_added"] = result.get("images_added", 0)
         
         if stats["images_added"] > 0:
-            print(f"  ✓ Added {stats['images_added']} images from S3")
+            out.append(f"  ✓ Added {stats['images_added']} images from S3")
         else:
-            print(f"  ⚠ No training images found in S3")
+            out.append(f"  ⚠ No training images found in S3")
         
         return stats
         
     except Exception as e:
         stats["error"] = str(e)
-        print(f"  ✗ Error: {e}")
+        out.append(f"  ✗ Error: {e}")
         return stats
+    finally:
+        if out:
+            with _print_lock:
+                print("\n".join(out), flush=True)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Migrate manifests by populating training_data from S3")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be done without making changes")
     parser.add_argument("--actor-id", type=str, help="Only migrate specific actor ID (e.g., 0107)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Number of manifests migrated in parallel (S3 scans are I/O bound)")
     args = parser.parse_args()
     
     print("=" * 80)
@@ -145,19 +222,25 @@ def main():
         "backups_created": 0
     }
     
-    # Migrate each manifest
-    for manifest_path in manifest_files:
-        stats = migrate_manifest(manifest_path, dry_run=args.dry_run)
+    # Migrate manifests in parallel; the S3 scans dominate and are I/O bound
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [
+            executor.submit(migrate_manifest, manifest_path, args.dry_run)
+            for manifest_path in manifest_files
+        ]
         
-        if stats["error"]:
-            total_stats["manifests_failed"] += 1
-        elif stats["skipped"]:
-            total_stats["manifests_skipped"] += 1
-        else:
-            total_stats["manifests_migrated"] += 1
-            total_stats["total_images_added"] += stats["images_added"]
-            if stats["backup_created"]:
-                total_stats["backups_created"] += 1
+        for future in as_completed(futures):
+            stats = future.result()
+            
+            if stats["error"]:
+                total_stats["manifests_failed"] += 1
+            elif stats["skipped"]:
+                total_stats["manifests_skipped"] += 1
+            else:
+                total_stats["manifests_migrated"] += 1
+                total_stats["total_images_added"] += stats["images_added"]
+                if stats["backup_created"]:
+                    total_stats["backups_created"] += 1
     
     # Print summary
     print("\n" + "=" * 80)
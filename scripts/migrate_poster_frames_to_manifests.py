@@ -9,20 +9,23 @@ This script:
 4. Keeps the local JSON files (they can be deleted manually later if needed)
 
 Usage:
-    python scripts/migrate_poster_frames_to_manifests.py [--dry-run]
+    python scripts/migrate_poster_frames_to_manifests.py [--dry-run] [--workers N]
 """
 
 import os
 import sys
-import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.utils import fast_json
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,14 +37,16 @@ logger = logging.getLogger(__name__)
 class PosterFrameMigrator:
     """Migrates poster frame URLs to actor manifests."""
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, workers: int = 16):
         """
         Initialize migrator.
         
         Args:
             dry_run: If True, only simulate actions without making changes
+            workers: Number of actors migrated concurrently
         """
         self.dry_run = dry_run
+        self.workers = workers
         
         self.stats = {
             'total_actors': 0,
@@ -51,6 +56,27 @@ class PosterFrameMigrator:
             'skipped_no_manifest': 0,
             'errors': 0
         }
+        # Actors are migrated on worker threads, so stats updates are locked
+        self._stats_lock = threading.Lock()
+        
+        # File names in data/actor_manifests (listed once, on first use)
+        self._manifest_names: Optional[Set[str]] = None
+    
+    def _count(self, key: str) -> None:
+        """Increment a stats counter (thread-safe)."""
+        with self._stats_lock:
+            self.stats[key] += 1
+    
+    def _list_manifest_names(self) -> Set[str]:
+        """List the manifest directory once and cache the file names."""
+        if self._manifest_names is None:
+            manifests_dir = project_root / "data" / "actor_manifests"
+            try:
+                with os.scandir(manifests_dir) as entries:
+                    self._manifest_names = {entry.name for entry in entries}
+            except FileNotFoundError:
+                self._manifest_names = set()
+        return self._manifest_names
     
     def find_all_actors(self) -> list:
         """Find all actor directories."""
@@ -60,10 +86,13 @@ class PosterFrameMigrator:
             logger.error(f"Actors directory not found: {actors_dir}")
             return []
         
-        actor_ids = []
-        for actor_dir in sorted(actors_dir.iterdir()):
-            if actor_dir.is_dir() and not actor_dir.name.startswith('.'):
-                actor_ids.append(actor_dir.name)
+        # DirEntry.is_dir() uses the type from the directory listing, so there
+        # is no stat per entry
+        with os.scandir(actors_dir) as entries:
+            actor_ids = sorted(
+                entry.name for entry in entries
+                if not entry.name.startswith('.') and entry.is_dir()
+            )
         
         logger.info(f"Found {len(actor_ids)} actors")
         return actor_ids
@@ -78,15 +107,11 @@ class PosterFrameMigrator:
         Returns:
             Path to poster frame JSON if found, None otherwise
         """
-        poster_frame_dir = project_root / "data" / "actors" / actor_id / "poster_frame"
-        
-        if not poster_frame_dir.exists():
-            return None
-        
-        # Look for the poster_urls.json file
-        poster_json = poster_frame_dir / f"{actor_id}_poster_urls.json"
+        # Look for the poster_urls.json file; a single stat also covers a
+        # missing poster_frame directory
+        poster_json = project_root / "data" / "actors" / actor_id / "poster_frame" / f"{actor_id}_poster_urls.json"
         
-        if poster_json.exists():
+        if os.path.isfile(poster_json):
             return poster_json
         
         return None
@@ -102,9 +127,7 @@ class PosterFrameMigrator:
             Poster frame data dictionary or None if error
         """
         try:
-            with open(poster_json_path, 'r') as f:
-                data = json.load(f)
-            return data
+            return fast_json.load_file(poster_json_path)
         except Exception as e:
             logger.error(f"Failed to read {poster_json_path}: {e}")
             return None
@@ -122,9 +145,10 @@ class PosterFrameMigrator:
         """
         # Extract numeric ID from actor_id (e.g., "0219" from "0219_asian_43_male")
         numeric_id = actor_id.split('_')[0]
-        manifest_path = project_root / "data" / "actor_manifests" / f"{numeric_id}_manifest.json"
+        manifest_name = f"{numeric_id}_manifest.json"
+        manifest_path = project_root / "data" / "actor_manifests" / manifest_name
         
-        if not manifest_path.exists():
+        if manifest_name not in self._list_manifest_names():
             logger.warning(f"  Manifest not found: {manifest_path}")
             return False
         
@@ -136,15 +160,13 @@ class PosterFrameMigrator:
         
         try:
             # Read manifest
-            with open(manifest_path, 'r') as f:
-                manifest = json.load(f)
+            manifest = fast_json.load_file(manifest_path)
             
             # Add poster_frames section
             manifest['poster_frames'] = poster_data
             
-            # Write updated manifest
-            with open(manifest_path, 'w') as f:
-                json.dump(manifest, f, indent=2)
+            # Write updated manifest (serialized in memory, written in one call)
+            fast_json.dump_file(manifest, manifest_path, indent=True)
             
             logger.info(f"  ✓ Manifest updated with poster frame data")
             return True
@@ -173,7 +195,7 @@ class PosterFrameMigrator:
             
             if not poster_json_path:
                 logger.info(f"  No poster frame JSON found for {actor_id}")
-                self.stats['skipped_no_poster'] += 1
+                self._count('skipped_no_poster')
                 return False
             
             logger.info(f"  Found poster frame JSON: {poster_json_path}")
@@ -183,23 +205,23 @@ class PosterFrameMigrator:
             
             if not poster_data:
                 logger.error(f"  Failed to read poster frame data")
-                self.stats['errors'] += 1
+                self._count('errors')
                 return False
             
-            self.stats['poster_frames_found'] += 1
+            self._count('poster_frames_found')
             
             # Update manifest
             if self.update_manifest(actor_id, poster_data):
-                self.stats['manifests_updated'] += 1
+                self._count('manifests_updated')
                 logger.info(f"  ✓ Successfully migrated poster frame data for {actor_id}")
                 return True
             else:
-                self.stats['skipped_no_manifest'] += 1
+                self._count('skipped_no_manifest')
                 return False
             
         except Exception as e:
             logger.error(f"  ✗ Error migrating {actor_id}: {e}", exc_info=True)
-            self.stats['errors'] += 1
+            self._count('errors')
             return False
     
     def migrate_all(self) -> Dict:
@@ -226,9 +248,13 @@ class PosterFrameMigrator:
             logger.error("No actors found!")
             return self.stats
         
-        # Migrate each actor
-        for actor_id in actor_ids:
-            self.migrate_actor(actor_id)
+        # List the manifests before the workers start looking them up
+        self._list_manifest_names()
+        
+        # Migrate actors concurrently; each one is a few small blocking file
+        # reads and writes, and every actor has its own manifest
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(self.migrate_actor, actor_ids))
         
         # Print summary
         self.print_summary()
@@ -274,11 +300,17 @@ Examples:
         action='store_true',
         help='Preview changes without making them'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=16,
+        help='Number of actors to migrate concurrently (default: 16)'
+    )
     
     args = parser.parse_args()
     
     # Create migrator and run
-    migrator = PosterFrameMigrator(dry_run=args.dry_run)
+    migrator = PosterFrameMigrator(dry_run=args.dry_run, workers=args.workers)
     stats = migrator.migrate_all()
     
     # Exit with error code if there were errors
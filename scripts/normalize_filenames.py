@@ -13,10 +13,31 @@ This script:
 
 import os
 import re
+import io
+import contextlib
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 
+# Characters removed from normalized names: anything but a-z, 0-9, _ and -
+_SPECIAL_CHARS_RE = re.compile(r'[^a-z0-9_\-]')
+
+# Translation table for plain ASCII names: lowercases letters, turns spaces
+# into underscores and deletes every other special character in one pass
+_ASCII_NORMALIZE = str.maketrans({
+    chr(code): (
+        chr(code).lower() if chr(code).isalnum() or chr(code) in '_-'
+        else '_' if chr(code) == ' '
+        else None
+    )
+    for code in range(128)
+})
+
+# Bytes allowed in an already-normalized name (deleted by the fast-path check)
+_NORMALIZED_NAME_BYTES = b'abcdefghijklmnopqrstuvwxyz0123456789_-'
+
 
 def normalize_filename(filename: str) -> str:
     """
@@ -35,24 +56,36 @@ def normalize_filename(filename: str) -> str:
     # Split filename and extension
     name, ext = os.path.splitext(filename)
     
-    # Decode URL encoding (e.g., %20 -> space)
-    name = urllib.parse.unquote(name)
-    
-    # Convert to lowercase
-    name = name.lower()
+    # Most files are already normalized: a C-level translate that deletes
+    # every allowed byte leaves nothing, and the underscore rules hold
+    if (name.isascii()
+            and not name.encode('ascii').translate(None, _NORMALIZED_NAME_BYTES)
+            and '__' not in name
+            and not name.startswith('_')
+            and not name.endswith('_')
+            and ext == ext.lower()):
+        return filename
     
-    # Replace spaces with underscores
-    name = name.replace(' ', '_')
-    
-    # Remove special characters, keep only alphanumeric, underscores, and hyphens
-    # This regex keeps: a-z, 0-9, _, -
-    name = re.sub(r'[^a-z0-9_\-]', '', name)
-    
-    # Remove multiple consecutive underscores
-    name = re.sub(r'_+', '_', name)
+    if name.isascii() and '%' not in name:
+        # Nothing to URL-decode and no Unicode case rules: lowercase, replace
+        # spaces and remove special characters with a single translate
+        name = name.translate(_ASCII_NORMALIZE)
+    else:
+        # Decode URL encoding (e.g., %20 -> space)
+        name = urllib.parse.unquote(name)
+        
+        # Convert to lowercase
+        name = name.lower()
+        
+        # Replace spaces with underscores
+        name = name.replace(' ', '_')
+        
+        # Remove special characters, keep only alphanumeric, underscores, and hyphens
+        # This regex keeps: a-z, 0-9, _, -
+        name = _SPECIAL_CHARS_RE.sub('', name)
     
-    # Remove leading/trailing underscores
-    name = name.strip('_')
+    # Collapse runs of underscores and drop leading/trailing ones
+    name = '_'.join(filter(None, name.split('_')))
     
     # Lowercase the extension too
     ext = ext.lower()
@@ -77,22 +110,27 @@ def process_style_directory(style_dir: Path, dry_run: bool = True) -> list:
         print(f"❌ Directory not found: {style_dir}")
         return changes
     
-    # Get all files in the directory
-    files = [f for f in style_dir.iterdir() if f.is_file()]
+    # Get all files in the directory; DirEntry.is_file() uses the type from
+    # the directory listing, so there is no stat per file
+    with os.scandir(style_dir) as entries:
+        files = [entry for entry in entries if entry.is_file()]
     
-    for file_path in files:
-        original_name = file_path.name
+    for entry in files:
+        original_name = entry.name
         normalized_name = normalize_filename(original_name)
+        file_path = Path(entry.path)
         
         # Skip if no change needed
         if original_name == normalized_name:
             changes.append((file_path, file_path, 'unchanged'))
             continue
         
-        new_path = file_path.parent / normalized_name
+        new_path = Path(os.path.join(style_dir, normalized_name))
         
-        # Check if target filename already exists
-        if new_path.exists() and new_path != file_path:
+        # Check if target filename already exists. This stays a real lookup
+        # rather than a check against the listing: on case-insensitive
+        # filesystems (macOS) "A_B.jpg" must block a rename to "a_b.jpg"
+        if os.path.exists(new_path):
             changes.append((file_path, new_path, 'conflict'))
             print(f"⚠️  CONFLICT: {original_name} -> {normalized_name} (target exists)")
             continue
@@ -102,7 +140,7 @@ def process_style_directory(style_dir: Path, dry_run: bool = True) -> list:
             print(f"📝 Would rename: {original_name} -> {normalized_name}")
         else:
             try:
-                file_path.rename(new_path)
+                os.rename(entry.path, new_path)
                 changes.append((file_path, new_path, 'renamed'))
                 print(f"✅ Renamed: {original_name} -> {normalized_name}")
             except Exception as e:
@@ -112,6 +150,20 @@ def process_style_directory(style_dir: Path, dry_run: bool = True) -> list:
     return changes
 
 
+def _process_style_directory_captured(style_dir: Path, dry_run: bool = True) -> tuple:
+    """
+    Run process_style_directory in a worker process, capturing its output.
+    
+    Returns:
+        Tuple of (changes, printed output) so the parent can print each
+        directory's report in order
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        changes = process_style_directory(style_dir, dry_run=dry_run)
+    return changes, output.getvalue()
+
+
 def main():
     """Main function to process all style directories."""
     import argparse
@@ -158,14 +210,23 @@ def main():
     if not args.execute:
         print("ℹ️  Running in dry-run mode. Use --execute to actually rename files.\n")
     
-    # Process each style directory
+    # Process each style directory; several directories are spread over
+    # worker processes, and each one's report is printed in sorted order
+    style_dirs = sorted(style_dirs)
+    process = partial(_process_style_directory_captured, dry_run=not args.execute)
     all_changes = []
-    for style_dir in sorted(style_dirs):
-        print(f"\n📁 Processing: {style_dir.name}")
-        print(f"{'─'*60}")
+    with contextlib.ExitStack() as stack:
+        if len(style_dirs) > 1:
+            results = stack.enter_context(ProcessPoolExecutor()).map(process, style_dirs)
+        else:
+            results = map(process, style_dirs)
         
-        changes = process_style_directory(style_dir, dry_run=not args.execute)
-        all_changes.extend(changes)
+        for style_dir, (changes, output) in zip(style_dirs, results):
+            print(f"\n📁 Processing: {style_dir.name}")
+            print(f"{'─'*60}")
+            print(output, end='')
+            
+            all_changes.extend(changes)
     
     # Summary
     print(f"\n{'='*60}")
@@ -4,9 +4,14 @@ Regenerate actorsData.ts from actorsData.json.
 This ensures the TypeScript file includes all fields from the JSON, including the 'good' flag.
 """
 
-import json
+import sys
 from pathlib import Path
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import fast_json
+
 def regenerate_actors_ts():
     """Regenerate the TypeScript file from JSON."""
     project_root = Path(__file__).parent.parent
@@ -20,16 +25,17 @@ def regenerate_actors_ts():
         return 1
     
     print(f"📖 Reading {json_file}")
-    with open(json_file, 'r') as f:
-        data = json.load(f)
+    data = fast_json.load_file(json_file)
     
     print(f"✍️  Writing {ts_file}")
-    with open(ts_file, 'w') as f:
-        f.write("// Auto-generated from system_actors/characters.json\n")
-        f.write("// This file contains all actor metadata including poster frames and LoRA URLs\n\n")
-        f.write("export const actorsLibraryData = ")
-        json.dump(data, f, indent=2)
-        f.write(";\n")
+    with open(ts_file, 'wb') as f:
+        f.write(
+            b"// Auto-generated from system_actors/characters.json\n"
+            b"// This file contains all actor metadata including poster frames and LoRA URLs\n\n"
+            b"export const actorsLibraryData = "
+            + fast_json.dumps(data, indent=True)
+            + b";\n"
+        )
     
     # Count actors with 'good' flag
     good_count = sum(1 for actor in data if actor.get('good', False))
@@ -6,7 +6,9 @@ import sys
 import os
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict
 from PIL import Image
 import io
 
@@ -15,6 +17,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from poster_frame_generator import PosterFrameGenerator
 from utils.s3 import S3Client, S3Config
+from utils import fast_json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # Configure logging
 logging.basicConfig(
@@ -24,42 +32,62 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def generate_webp_versions(image_bytes: bytes) -> dict:
+def _encode_webp(img: Image.Image) -> bytes:
+    """Encode an image as WebP (quality 85, slowest/smallest method)."""
+    output = io.BytesIO()
+    img.save(output, format='WEBP', quality=85, method=6)
+    return output.getvalue()
+
+
+def resize_poster_frame(image_bytes: bytes) -> dict:
     """
-    Generate multiple WebP versions of the image.
+    Resize the image to the poster frame sizes.
     
     Args:
         image_bytes: Original image bytes
     
     Returns:
-        Dict with sm, md, lg versions as bytes
+        Dict with lg, md, sm versions as PIL images
     """
-    from PIL import Image
-    import io
-    
     # Open image
     img = Image.open(io.BytesIO(image_bytes))
     
-    # Define sizes
+    # Define sizes (largest first, see below)
     sizes = {
-        'sm': (256, 256),
+        'lg': (1024, 1024),
         'md': (512, 512),
-        'lg': (1024, 1024)
+        'sm': (256, 256)
     }
     
-    versions = {}
+    resized = {}
     
+    # Resize as a pyramid: each size is downscaled from the previous one, so
+    # only the first Lanczos pass reads the full-resolution image
+    source = img
     for size_name, (width, height) in sizes.items():
-        # Resize image
-        resized = img.copy()
-        resized.thumbnail((width, height), Image.Resampling.LANCZOS)
-        
-        # Convert to WebP
-        output = io.BytesIO()
-        resized.save(output, format='WEBP', quality=85, method=6)
-        versions[size_name] = output.getvalue()
+        source = source.copy()
+        source.thumbnail((width, height), Image.Resampling.LANCZOS)
+        resized[size_name] = source
+    
+    return resized
+
+
+def generate_webp_versions(image_bytes: bytes) -> dict:
+    """
+    Generate multiple WebP versions of the image.
+    
+    Args:
+        image_bytes: Original image bytes
+    
+    Returns:
+        Dict with lg, md, sm versions as bytes
+    """
+    resized = resize_poster_frame(image_bytes)
     
-    return versions
+    # Convert to WebP; libwebp releases the GIL, so the sizes encode in parallel
+    with ThreadPoolExecutor(max_workers=len(resized)) as executor:
+        encoded = executor.map(_encode_webp, resized.values())
+        return dict(zip(resized, encoded))
 
 
 def upload_poster_frames_to_s3(
@@ -74,7 +102,9 @@ def upload_poster_frames_to_s3(
     Args:
         actor_id: Actor ID (e.g., "0001")
         actor_name: Actor name
-        webp_versions: Dict with sm, md, lg WebP bytes
+        webp_versions: Dict with sm, md, lg WebP bytes, or resized PIL images;
+            images are encoded on the upload threads, so each size starts
+            uploading as soon as its own encode finishes
         s3_client: S3Client instance
     
     Returns:
@@ -92,17 +122,30 @@ def upload_poster_frames_to_s3(
         'standard': {}
     }
     
-    for size_name, image_bytes in webp_versions.items():
-        key = f"{base_key}/{actor_name}_poster_{size_name}.webp"
-        
-        # Upload to S3
-        result = s3_client.upload_file(
-            file_data=image_bytes,
+    keys = {
+        size_name: f"{base_key}/{actor_name}_poster_{size_name}.webp"
+        for size_name in webp_versions
+    }
+    
+    def upload(size_name: str, key: str) -> Dict[str, Any]:
+        version = webp_versions[size_name]
+        if isinstance(version, Image.Image):
+            version = _encode_webp(version)
+        return s3_client.upload_file(
+            file_data=version,
             bucket=bucket,
             key=key,
             content_type="image/webp"
         )
-        
+    
+    # Upload to S3; the sizes are independent PUTs (the boto3 client is
+    # thread-safe), so they go out concurrently
+    with ThreadPoolExecutor(max_workers=len(keys) or 1) as executor:
+        futures = [executor.submit(upload, size_name, key) for size_name, key in keys.items()]
+        for future in futures:
+            future.result()
+    
+    for size_name, key in keys.items():
         # Build URLs
         region = S3Config.AWS_REGION
         standard_url = f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
@@ -132,8 +175,7 @@ def update_actors_data(actor_id: str, poster_frame_urls: dict, project_root: Pat
         return
     
     # Load actors data
-    with open(actors_data_path, 'r') as f:
-        actors_data = json.load(f)
+    actors_data = fast_json.load_file(actors_data_path)
     
     # Find and update actor
     for actor in actors_data:
@@ -146,12 +188,38 @@ def update_actors_data(actor_id: str, poster_frame_urls: dict, project_root: Pat
         return
     
     # Save updated data
-    with open(actors_data_path, 'w') as f:
-        json.dump(actors_data, f, indent=2)
+    fast_json.dump_file(actors_data, actors_data_path, indent=True)
     
     logger.info(f"Saved updated actorsData.json")
 
 
+def find_actor(actors_data_path: Path, actor_id: str) -> dict:
+    """
+    Look up one actor in actorsData.json.
+    
+    With ijson installed the array is parsed one actor at a time and the
+    scan stops at the match, so the full list is never materialized.
+    
+    Args:
+        actors_data_path: Path to actorsData.json
+        actor_id: Actor ID
+    
+    Returns:
+        Actor dict, or None if not found
+    """
+    actor_id = str(actor_id)
+    
+    if ijson is None:
+        actors = fast_json.load_file(actors_data_path)
+        return next((actor for actor in actors if str(actor.get('id')) == actor_id), None)
+    
+    with open(actors_data_path, 'rb') as f:
+        for actor in ijson.items(f, 'item', use_float=True):
+            if str(actor.get('id')) == actor_id:
+                return actor
+    return None
+
+
 def main():
     if len(sys.argv) < 3:
         print(json.dumps({
@@ -176,12 +244,9 @@ def main():
         if not actor_description:
             actors_data_path = project_root / "data" / "actorsData.json"
             if actors_data_path.exists():
-                with open(actors_data_path, 'r') as f:
-                    actors_data = json.load(f)
-                    for actor in actors_data:
-                        if str(actor.get('id')) == str(actor_id):
-                            actor_description = actor.get('face_prompt', '')
-                            break
+                actor = find_actor(actors_data_path, actor_id)
+                if actor is not None:
+                    actor_description = actor.get('face_prompt', '')
         
         if not actor_description:
             actor_description = f"a person"
@@ -215,17 +280,17 @@ def main():
         image_bytes = response.content
         logger.info(f"✅ Downloaded image ({len(image_bytes)} bytes)")
         
-        # Step 3: Generate WebP versions
-        logger.info("Step 3: Generating WebP versions (sm, md, lg)...")
-        webp_versions = generate_webp_versions(image_bytes)
-        logger.info(f"✅ Generated {len(webp_versions)} WebP versions")
+        # Step 3: Resize to the poster frame sizes
+        logger.info("Step 3: Resizing poster frame (lg, md, sm)...")
+        resized_versions = resize_poster_frame(image_bytes)
+        logger.info(f"✅ Resized to {len(resized_versions)} sizes")
         
-        # Step 4: Upload to S3
-        logger.info("Step 4: Uploading to S3...")
+        # Step 4: Encode to WebP and upload to S3, pipelined per size
+        logger.info("Step 4: Encoding WebP versions and uploading to S3...")
         poster_frame_urls = upload_poster_frames_to_s3(
             actor_id=actor_id,
             actor_name=actor_name,
-            webp_versions=webp_versions,
+            webp_versions=resized_versions,
             s3_client=s3_client
         )
         logger.info(f"✅ Uploaded all versions to S3")
@@ -11,38 +11,42 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.utils.s3 import S3Client
+from src.utils import fast_json
 
 
 def main():
     """List files in S3 for a style with metadata for hash comparison."""
     try:
         # Read arguments from stdin
-        data = json.loads(sys.stdin.read())
+        data = fast_json.loads(sys.stdin.buffer.read())
         style_id = data['styleId']
         bucket = os.getenv("AWS_ASSETS_BUCKET", "storyboard-user-files")
         prefix = f"styles/{style_id}/"
         
         client = S3Client()
-        files = client.list_files(bucket, prefix)
         
-        # Build file map with metadata for hash comparison
+        # Build file map with metadata for hash comparison, page by page
+        # (boto3 always returns LastModified as a datetime)
         file_map = {}
-        for f in files:
-            filename = f['Key'].split('/')[-1]
+        for f in client.iter_files(bucket, prefix):
+            filename = f['Key'].rsplit('/', 1)[-1]
             file_map[filename] = {
                 'etag': f['ETag'].strip('"'),  # Remove quotes from ETag
                 'size': f['Size'],
-                'lastModified': f.get('LastModified', '').isoformat() if hasattr(f.get('LastModified', ''), 'isoformat') else str(f.get('LastModified', ''))
+                'lastModified': f['LastModified'].isoformat()
             }
         
         # Also return simple filename list for backwards compatibility
         filenames = list(file_map.keys())
         
-        print(json.dumps({
+        # Serialized with orjson when available and written as bytes in one go;
+        # listings can run to thousands of entries
+        sys.stdout.buffer.write(fast_json.dumps({
             "files": filenames,
             "fileMap": file_map,
             "count": len(filenames)
-        }))
+        }) + b"\n")
+        sys.stdout.buffer.flush()
         
     except Exception as e:
         print(json.dumps({"error": str(e), "files": [], "fileMap": {}}), file=sys.stderr)
@@ -7,22 +7,62 @@ import os
 import logging
 import base64
 import requests
-from typing import Dict, Any, Optional, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Optional, List, BinaryIO
 import replicate
 
 logger = logging.getLogger(__name__)
 
 
+def create_download_session(pool_size: int = 4) -> requests.Session:
+    """
+    Create a requests session with a pooled, retrying HTTPS adapter.
+    
+    Reusing one session keeps TCP/TLS connections alive across image
+    downloads instead of paying a fresh handshake per file.
+    
+    Args:
+        pool_size: Number of hosts to keep pools for; each pool holds up to
+                   twice as many connections
+        
+    Returns:
+        Configured requests.Session
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size * 2,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class ReplicateService:
     """Service for interacting with Replicate API for image generation and upscaling."""
     
-    def __init__(self, api_token: Optional[str] = None, timeout: int = 300):
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        timeout: int = 300,
+        session: Optional[requests.Session] = None
+    ):
         """
         Initialize Replicate service.
         
         Args:
             api_token: Replicate API token (defaults to REPLICATE_API_TOKEN env var)
             timeout: Timeout in seconds for prediction polling (default: 300s = 5 minutes)
+            session: Session used for image downloads (defaults to a pooled
+                     session from create_download_session)
         """
         self.api_token = api_token or os.getenv("REPLICATE_API_TOKEN")
         if not self.api_token:
@@ -35,6 +75,7 @@ class ReplicateService:
             timeout=httpx.Timeout(timeout=timeout, connect=30.0)
         )
         self.timeout = timeout
+        self.session = session or create_download_session()
         logger.info(f"ReplicateService initialized with {timeout}s timeout")
     
     def generate_grid_with_flux_kontext(
@@ -180,7 +221,7 @@ class ReplicateService:
         logger.debug(f"Downloading image from: {image_url}")
         
         try:
-            response = requests.get(image_url, timeout=60)
+            response = self.session.get(image_url, timeout=60)
             response.raise_for_status()
             
             image_base64 = base64.b64encode(response.content).decode('utf-8')
@@ -205,7 +246,7 @@ class ReplicateService:
         logger.debug(f"Downloading image bytes from: {image_url}")
         
         try:
-            response = requests.get(image_url, timeout=60)
+            response = self.session.get(image_url, timeout=60)
             response.raise_for_status()
             
             logger.debug(f"Image bytes downloaded successfully ({len(response.content)} bytes)")
@@ -214,3 +255,41 @@ class ReplicateService:
         except Exception as e:
             logger.error(f"Failed to download image bytes: {e}")
             raise
+    
+    def download_image_to_file(
+        self,
+        image_url: str,
+        fileobj: BinaryIO,
+        chunk_size: int = 256 * 1024
+    ) -> int:
+        """
+        Stream an image from URL into a writable file object.
+        
+        The response is written chunk by chunk, so the full image is never
+        held in memory.
+        
+        Args:
+            image_url: URL of the image to download
+            fileobj: Writable binary file-like object
+            chunk_size: Bytes per chunk read from the response
+            
+        Returns:
+            Number of bytes written
+        """
+        logger.debug(f"Streaming image from: {image_url}")
+        
+        try:
+            with self.session.get(image_url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                
+                total = 0
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    fileobj.write(chunk)
+                    total += len(chunk)
+            
+            logger.debug(f"Image streamed successfully ({total} bytes)")
+            return total
+            
+        except Exception as e:
+            logger.error(f"Failed to stream image: {e}")
+            raise
@@ -30,6 +30,7 @@ class RunPodConfig:
     POLLING_INTERVAL: float = float(os.getenv("POLLING_INTERVAL", "1.0"))  # 1 second
     MAX_POLLING_DURATION: int = int(os.getenv("MAX_POLLING_DURATION", "180"))  # 3 minutes
     MAX_POLLING_ATTEMPTS: int = int(os.getenv("MAX_POLLING_ATTEMPTS", "120"))
+    MAX_POLLING_BACKOFF: float = float(os.getenv("MAX_POLLING_BACKOFF", "5.0"))  # async poll delay cap
     
     @classmethod
     def validate(cls) -> None:
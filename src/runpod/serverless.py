@@ -2,15 +2,36 @@
 RunPod serverless image generation with intelligent polling.
 Based on runpodServerlessImageRequest.ts from the backend.
 """
+import json
 import time
+import asyncio
 import logging
 import requests
+import httpx
 from typing import Dict, Any, Optional, List
 from .config import RunPodConfig
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _encode_body(payload: Dict[str, Any]) -> bytes:
+    """
+    Serialize a request payload to JSON bytes.
+    
+    The body is dominated by the multi-MB base64 source image, which orjson
+    copies at memcpy speed where stdlib json scans it for escapes. (src.utils
+    is not imported here because it imports this package back.)
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
 class RunPodServerlessClient:
     """Client for RunPod serverless image generation."""
     
@@ -26,11 +47,12 @@ class RunPodServerlessClient:
             raise ValueError("RunPod API key is required")
         
         self.base_url = "https://api.runpod.ai/v2"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
-        })
+        }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
     
     def generate_image(
         self,
@@ -76,7 +98,7 @@ class RunPodServerlessClient:
             url = f"{self.base_url}/{endpoint_id}/runsync"
             response = self.session.post(
                 url,
-                json=modified_payload,
+                data=_encode_body(modified_payload),
                 timeout=RunPodConfig.SYNC_TIMEOUT
             )
             response.raise_for_status()
@@ -122,57 +144,96 @@ class RunPodServerlessClient:
         start_time = time.time()
         attempts = 0
         
-        while (
-            time.time() - start_time < RunPodConfig.MAX_POLLING_DURATION
-            and attempts < RunPodConfig.MAX_POLLING_ATTEMPTS
-        ):
+        while self._polling_active(start_time, attempts):
             time.sleep(RunPodConfig.POLLING_INTERVAL)
             attempts += 1
             
             try:
-                url = f"{self.base_url}/{endpoint_id}/status/{job_id}"
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                status = data.get("status")
-                logger.debug(
-                    f"{log_prefix} | Poll #{attempts}/{RunPodConfig.MAX_POLLING_ATTEMPTS} | "
-                    f"Status: {status}"
+                response = self.session.get(
+                    f"{self.base_url}/{endpoint_id}/status/{job_id}", timeout=30
                 )
-                
-                # Check for terminal status
-                if status in ["COMPLETED", "FAILED", "CANCELLED"]:
-                    logger.info(
-                        f"{log_prefix} | Job reached terminal status: {status}"
-                    )
-                    return data
-                
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 404:
-                    logger.error(f"{log_prefix} | Job not found (404): {job_id}")
-                    return {
-                        "id": job_id,
-                        "status": "FAILED",
-                        "output": {"status": "failed", "error": "Job not found"}
-                    }
-                logger.warning(f"{log_prefix} | Poll error: {str(e)}")
+                data = self._check_poll_response(response, job_id, attempts, log_prefix)
             except Exception as e:
-                logger.warning(f"{log_prefix} | Poll error: {str(e)}")
-                if attempts >= RunPodConfig.MAX_POLLING_ATTEMPTS:
-                    return {
-                        "id": job_id,
-                        "status": "FAILED",
-                        "output": {"status": "failed", "error": "Polling exhausted"}
-                    }
-        
-        # Timeout - try to cancel the job
+                data = self._poll_error(e, job_id, attempts, log_prefix)
+            if data is not None:
+                return data
+        
+        result = self._polling_timeout(job_id, attempts, log_prefix)
+        self._cancel_job(endpoint_id, job_id, log_prefix)
+        return result
+    
+    @staticmethod
+    def _polling_active(start_time: float, attempts: int) -> bool:
+        """Whether polling is still within its duration and attempt limits."""
+        return (
+            time.time() - start_time < RunPodConfig.MAX_POLLING_DURATION
+            and attempts < RunPodConfig.MAX_POLLING_ATTEMPTS
+        )
+    
+    @staticmethod
+    def _check_poll_response(
+        response: Any,
+        job_id: str,
+        attempts: int,
+        log_prefix: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Decide whether a /status response ends polling.
+        
+        Works with both requests and httpx responses.
+        
+        Returns:
+            Final job data if the job is gone or reached a terminal status,
+            otherwise None to keep polling
+        """
+        if response.status_code == 404:
+            logger.error(f"{log_prefix} | Job not found (404): {job_id}")
+            return {
+                "id": job_id,
+                "status": "FAILED",
+                "output": {"status": "failed", "error": "Job not found"}
+            }
+        response.raise_for_status()
+        data = response.json()
+        
+        status = data.get("status")
+        logger.debug(
+            f"{log_prefix} | Poll #{attempts}/{RunPodConfig.MAX_POLLING_ATTEMPTS} | "
+            f"Status: {status}"
+        )
+        
+        # Check for terminal status
+        if status in ["COMPLETED", "FAILED", "CANCELLED"]:
+            logger.info(
+                f"{log_prefix} | Job reached terminal status: {status}"
+            )
+            return data
+        return None
+    
+    @staticmethod
+    def _poll_error(
+        error: Exception,
+        job_id: str,
+        attempts: int,
+        log_prefix: str
+    ) -> Optional[Dict[str, Any]]:
+        """Log a failed poll; returns final job data once attempts run out."""
+        logger.warning(f"{log_prefix} | Poll error: {str(error)}")
+        if attempts >= RunPodConfig.MAX_POLLING_ATTEMPTS:
+            return {
+                "id": job_id,
+                "status": "FAILED",
+                "output": {"status": "failed", "error": "Polling exhausted"}
+            }
+        return None
+    
+    @staticmethod
+    def _polling_timeout(job_id: str, attempts: int, log_prefix: str) -> Dict[str, Any]:
+        """Log a polling timeout and build the failed job data (caller cancels the job)."""
         logger.warning(
             f"{log_prefix} | Polling timeout after {attempts} attempts. "
             f"Attempting to cancel job."
         )
-        self._cancel_job(endpoint_id, job_id, log_prefix)
-        
         return {
             "id": job_id,
             "status": "FAILED",
@@ -191,6 +252,141 @@ class RunPodServerlessClient:
         except Exception as e:
             logger.warning(f"{log_prefix} | Failed to cancel job: {str(e)}")
     
+    async def generate_image_async(
+        self,
+        payload: Dict[str, Any],
+        mode: str = "wizard",
+        request_id: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Non-blocking variant of generate_image.
+        
+        Awaits /runsync and polls /status with backoff on the event loop
+        instead of blocking the thread, so many jobs can be in flight
+        concurrently (e.g. via asyncio.gather).
+        
+        Args:
+            payload: The generation payload with workflow and parameters
+            mode: Generation mode ('wizard', 'new_pre', 'posterFrameRegeneration')
+            request_id: Optional request ID for tracking
+            client: Optional shared httpx.AsyncClient (one is created if omitted)
+        
+        Returns:
+            Response dict with status and output, or None on failure
+        """
+        if client is None:
+            async with httpx.AsyncClient() as owned_client:
+                return await self.generate_image_async(
+                    payload, mode=mode, request_id=request_id, client=owned_client
+                )
+        
+        serverless_start = time.time()
+        
+        # Get appropriate endpoint
+        endpoint_id = RunPodConfig.get_serverless_endpoint(mode)
+        if not endpoint_id:
+            logger.error(f"No serverless endpoint configured for mode: {mode}")
+            return None
+        
+        log_prefix = f"[SERVERLESS] requestId={request_id or 'N/A'}"
+        logger.info(
+            f"{log_prefix} | Initiating async request | mode={mode} | endpoint={endpoint_id}"
+        )
+        
+        # Add timestamp to payload
+        modified_payload = {
+            **payload,
+            "input": {
+                **payload.get("input", {}),
+                "timestamp": int(time.time() * 1000)
+            }
+        }
+        
+        try:
+            response = await client.post(
+                f"{self.base_url}/{endpoint_id}/runsync",
+                content=_encode_body(modified_payload),
+                headers=self.headers,
+                timeout=RunPodConfig.SYNC_TIMEOUT
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            logger.info(f"{log_prefix} | Initial response status: {data.get('status')}")
+            
+            # Poll if job is in progress or queued
+            if data.get("status") in ["IN_PROGRESS", "IN_QUEUE"]:
+                data = await self._poll_status_async(client, endpoint_id, data.get("id"), log_prefix)
+            
+            duration_ms = (time.time() - serverless_start) * 1000
+            return self._handle_final_status(data, endpoint_id, request_id, duration_ms)
+            
+        except httpx.TimeoutException:
+            logger.error(
+                f"{log_prefix} | Timeout after {RunPodConfig.SYNC_TIMEOUT}s"
+            )
+            return None
+        except Exception as e:
+            logger.error(f"{log_prefix} | Request error: {str(e)}")
+            return None
+    
+    async def _poll_status_async(
+        self,
+        client: httpx.AsyncClient,
+        endpoint_id: str,
+        job_id: str,
+        log_prefix: str
+    ) -> Dict[str, Any]:
+        """
+        Poll job status on the event loop until completion or timeout.
+        
+        The delay between polls starts at POLLING_INTERVAL and backs off
+        up to MAX_POLLING_BACKOFF.
+        
+        Args:
+            client: httpx.AsyncClient used for the status requests
+            endpoint_id: RunPod endpoint ID
+            job_id: Job ID to poll
+            log_prefix: Logging prefix
+        
+        Returns:
+            Final job data
+        """
+        logger.info(f"{log_prefix} | Starting async polling for job: {job_id}")
+        start_time = time.time()
+        attempts = 0
+        delay = RunPodConfig.POLLING_INTERVAL
+        
+        while self._polling_active(start_time, attempts):
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, RunPodConfig.MAX_POLLING_BACKOFF)
+            attempts += 1
+            
+            try:
+                response = await client.get(
+                    f"{self.base_url}/{endpoint_id}/status/{job_id}",
+                    headers=self.headers,
+                    timeout=30
+                )
+                data = self._check_poll_response(response, job_id, attempts, log_prefix)
+            except Exception as e:
+                data = self._poll_error(e, job_id, attempts, log_prefix)
+            if data is not None:
+                return data
+        
+        result = self._polling_timeout(job_id, attempts, log_prefix)
+        try:
+            await client.post(
+                f"{self.base_url}/{endpoint_id}/cancel/{job_id}",
+                headers=self.headers,
+                timeout=10
+            )
+            logger.info(f"{log_prefix} | Successfully cancelled job: {job_id}")
+        except Exception as e:
+            logger.warning(f"{log_prefix} | Failed to cancel job: {str(e)}")
+        return result
+    
     def _handle_final_status(
         self,
         data: Dict[str, Any],
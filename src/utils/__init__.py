@@ -28,6 +28,8 @@ from .image_processing import (
     get_image_info,
     create_thumbnail,
     validate_image,
+    resize_image_for_gpt,
+    resize_image_for_gpt_cached,
 )
 
 from .openai_client import (
@@ -64,6 +66,8 @@ __all__ = [
     'get_image_info',
     'create_thumbnail',
     'validate_image',
+    'resize_image_for_gpt',
+    'resize_image_for_gpt_cached',
     
     # Image generation
     'ImageGenerator',
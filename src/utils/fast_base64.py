@@ -0,0 +1,44 @@
+"""
+Base64 helpers.
+Uses pybase64 (SIMD-accelerated) when it is installed and falls back to the
+standard library.
+"""
+import base64
+from typing import Union
+
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def b64encode(data: BytesLike) -> str:
+    """
+    Encode bytes as a base64 string.
+    
+    Args:
+        data: Bytes or any buffer-protocol object
+    
+    Returns:
+        Base64-encoded ASCII string
+    """
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode('ascii')
+
+
+def b64decode(data: Union[str, BytesLike]) -> bytes:
+    """
+    Decode a base64 string.
+    
+    Args:
+        data: Base64-encoded str or bytes
+    
+    Returns:
+        Decoded bytes
+    """
+    if pybase64 is not None:
+        return pybase64.b64decode(data)
+    return base64.b64decode(data)
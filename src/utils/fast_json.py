@@ -0,0 +1,108 @@
+"""
+JSON serialization helpers.
+Uses orjson when it is installed and falls back to the standard library.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+PathLike = Union[str, os.PathLike]
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+    
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2-space indentation
+    
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+    return text.encode('utf-8')
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Parse a JSON document.
+    
+    Args:
+        data: JSON as bytes or str
+    
+    Returns:
+        Parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: PathLike) -> Any:
+    """
+    Read and parse a JSON file.
+    
+    Args:
+        path: Path to the JSON file
+    
+    Returns:
+        Parsed object
+    """
+    return loads(Path(path).read_bytes())
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write data through an unbuffered file object.
+    
+    The payload is already fully serialized, so a buffer adds nothing;
+    skipping it also avoids the isatty() probe a buffered open() makes.
+    """
+    with open(path, 'wb', buffering=0) as f:
+        view = memoryview(data)
+        while view:
+            view = view[f.write(view):]
+
+
+def dump_file(obj: Any, path: PathLike, indent: bool = False, atomic: bool = False) -> None:
+    """
+    Serialize an object and write it to a file in a single write.
+    
+    Args:
+        obj: Object to serialize
+        path: Destination path
+        indent: Pretty-print with 2-space indentation
+        atomic: Write to a temporary file next to path and rename it into
+            place, so readers never see a partially written file
+    """
+    data = dumps(obj, indent=indent)
+    path = Path(path)
+    
+    if not atomic:
+        _write_bytes(path, data)
+        return
+    
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        _write_bytes(tmp_path, data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
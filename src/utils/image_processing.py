@@ -3,11 +3,17 @@ Image processing utilities.
 Handles image format conversion, resizing, and encoding.
 """
 import base64
+import hashlib
 import io
 import logging
+import math
+import os
+from pathlib import Path
 from typing import Union, Optional, Tuple
 from PIL import Image
 
+from .fast_base64 import b64encode
+
 logger = logging.getLogger(__name__)
 
 
@@ -288,3 +294,102 @@ def validate_image(image: Union[bytes, Image.Image]) -> bool:
     except Exception as e:
         logger.debug(f"Image validation failed: {e}")
         return False
+
+
+def resize_image_for_gpt(image_path: str, max_size: int = 768) -> str:
+    """
+    Resize image to reduce token usage while maintaining aspect ratio.
+    Returns base64 encoded JPEG.
+    
+    Args:
+        image_path: Path to image file
+        max_size: Maximum dimension (width or height)
+    
+    Returns:
+        Base64 encoded resized JPEG, without a data URI prefix (the OpenAI
+        client adds it when building the request)
+    """
+    try:
+        with Image.open(image_path) as img:
+            # For JPEGs, let libjpeg DCT-scale during decode (1/2, 1/4 or 1/8)
+            # to the smallest size that still covers the target
+            width, height = img.size
+            scale = max_size / max(width, height)
+            if img.format == 'JPEG' and scale < 1:
+                img.draft('RGB', (math.ceil(width * scale), math.ceil(height * scale)))
+            
+            # Convert to RGB if necessary (handles RGBA, P, etc.)
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            
+            # Shrink in place, maintaining aspect ratio. reducing_gap does a
+            # cheap box reduction to within 2x of the target before LANCZOS.
+            img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            
+            # Save to BytesIO and convert to base64
+            buffer = io.BytesIO()
+            # The vision model downsamples further, so favour small/fast output:
+            # 4:2:0 chroma subsampling, baseline, no Huffman optimisation pass
+            img.save(
+                buffer, format='JPEG', quality=80, subsampling=2,
+                optimize=False, progressive=False
+            )
+            
+            # Encode straight from the BytesIO's memory (getbuffer) instead
+            # of a getvalue() copy
+            with buffer.getbuffer() as jpeg_view:
+                return b64encode(jpeg_view)
+            
+    except Exception as e:
+        raise Exception(f"Failed to process image {image_path}: {str(e)}")
+
+
+# Bump when resize_image_for_gpt's output changes, to invalidate cached entries
+GPT_IMAGE_CACHE_VERSION = 1
+
+
+def resize_image_for_gpt_cached(
+    image_path: str,
+    cache_dir: Union[str, os.PathLike],
+    max_size: int = 768
+) -> str:
+    """
+    resize_image_for_gpt with an on-disk cache of the base64 result.
+    
+    Entries are keyed by the image's path, mtime, size and max_size, so the
+    caption and prompt scripts share one entry per image and an edited file
+    is re-encoded. A cache hit skips decode, resize, encode and base64.
+    
+    Args:
+        image_path: Path to image file
+        cache_dir: Directory holding cached entries
+        max_size: Maximum dimension (width or height)
+    
+    Returns:
+        Base64 encoded resized JPEG, without a data URI prefix
+    """
+    st = os.stat(image_path)
+    key = hashlib.blake2b(
+        f"{GPT_IMAGE_CACHE_VERSION}:{os.path.abspath(image_path)}:"
+        f"{st.st_mtime_ns}:{st.st_size}:{max_size}".encode(),
+        digest_size=16
+    ).hexdigest()
+    cache_path = Path(cache_dir) / f"{key}.txt"
+    
+    try:
+        return cache_path.read_text(encoding='ascii')
+    except OSError:
+        pass
+    
+    image_base64 = resize_image_for_gpt(image_path, max_size)
+    
+    # Write atomically so a concurrent reader never sees a partial entry
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(image_base64, encoding='ascii')
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Failed to cache resized image for {image_path}: {e}")
+    
+    return image_base64
@@ -3,18 +3,32 @@ Simple OpenAI GPT client for text and vision completions.
 Based on backend gpt.ts patterns.
 """
 import os
+import asyncio
+import importlib.util
 import logging
 import time
 from typing import Dict, Any, Optional, List, Union
 
+import httpx
+
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
 except ImportError:
     raise ImportError(
         "openai is required for GPT functionality. "
         "Install it with: pip install openai"
     )
 
+try:
+    # Keep the SDK's default timeouts/redirect handling on our own pools
+    from openai import DefaultHttpxClient, DefaultAsyncHttpxClient
+except ImportError:  # openai < 1.17
+    DefaultHttpxClient = httpx.Client
+    DefaultAsyncHttpxClient = httpx.AsyncClient
+
+# HTTP/2 multiplexes concurrent requests over one connection (needs the h2 package)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +45,9 @@ class OpenAIConfig:
     DEFAULT_TEMPERATURE = 0.7
     DEFAULT_MAX_TOKENS = 1000
     
+    # HTTP connection pool size, shared by all requests made through a client
+    MAX_CONNECTIONS = 32
+    
     @classmethod
     def validate(cls) -> None:
         """Validate that required OpenAI credentials are set."""
@@ -61,9 +78,33 @@ class OpenAIClient:
                 "or pass api_key to the constructor."
             )
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(
+            api_key=self.api_key,
+            http_client=DefaultHttpxClient(limits=self._pool_limits(), http2=HTTP2_AVAILABLE)
+        )
+        self._async_client = None
         logger.debug("OpenAI client initialized successfully")
     
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI client sharing this client's API key, created on first use."""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=self._pool_limits(), http2=HTTP2_AVAILABLE
+                )
+            )
+        return self._async_client
+    
+    @staticmethod
+    def _pool_limits() -> httpx.Limits:
+        """Keep-alive pool limits: one client serves a whole batch of requests."""
+        return httpx.Limits(
+            max_connections=OpenAIConfig.MAX_CONNECTIONS,
+            max_keepalive_connections=OpenAIConfig.MAX_CONNECTIONS
+        )
+    
     def text_completion(
         self,
         prompt: str,
@@ -159,35 +200,21 @@ class OpenAIClient:
                     logger.error(f"Failed after {max_retries} attempts")
                     raise
     
-    def vision_completion(
+    def _build_vision_params(
         self,
         prompt: str,
-        image_url: Optional[str] = None,
-        image_base64: Optional[str] = None,
-        model: str = OpenAIConfig.DEFAULT_VISION_MODEL,
-        temperature: float = OpenAIConfig.DEFAULT_TEMPERATURE,
-        max_tokens: int = OpenAIConfig.DEFAULT_MAX_TOKENS,
-        system_message: Optional[str] = None,
-        json_mode: bool = False,
-        max_retries: int = 3
-    ) -> Union[str, Dict[str, Any]]:
+        image_url: Optional[str],
+        image_base64: Optional[str],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        system_message: Optional[str],
+        json_mode: bool,
+        image_mime_type: str = "image/jpeg"
+    ) -> Dict[str, Any]:
         """
-        Vision completion with image + text prompt.
+        Validate vision arguments and build chat completion request params.
         
-        Args:
-            prompt: Text prompt describing what to analyze
-            image_url: URL of image to analyze (mutually exclusive with image_base64)
-            image_base64: Base64 encoded image (mutually exclusive with image_url)
-            model: Vision model to use (default: gpt-4o)
-            temperature: Sampling temperature
-            max_tokens: Maximum tokens in response
-            system_message: Optional system message
-            json_mode: If True, forces JSON output
-            max_retries: Number of retry attempts
-        
-        Returns:
-            String response or dict if json_mode=True
-            
         Raises:
             ValueError: If neither or both image_url and image_base64 provided
         """
@@ -207,9 +234,9 @@ class OpenAIClient:
         if image_url:
             image_content = {"type": "image_url", "image_url": {"url": image_url}}
         else:
-            # Base64 image with data URI
+            # Base64 image with data URI (built here, once, for raw base64 input)
             if not image_base64.startswith("data:"):
-                image_base64 = f"data:image/jpeg;base64,{image_base64}"
+                image_base64 = f"data:{image_mime_type};base64,{image_base64}"
             image_content = {"type": "image_url", "image_url": {"url": image_base64}}
         
         # Build messages
@@ -254,6 +281,88 @@ class OpenAIClient:
         if json_mode:
             params["response_format"] = {"type": "json_object"}
         
+        return params
+    
+    def _parse_vision_response(self, response: Any, json_mode: bool) -> Union[str, Dict[str, Any]]:
+        """Log usage for a vision response and extract its content."""
+        content = response.choices[0].message.content
+        
+        logger.info(f"✅ [API-SUCCESS] Vision completion successful")
+        logger.info(f"   Tokens used: {response.usage.total_tokens} (prompt: {response.usage.prompt_tokens}, completion: {response.usage.completion_tokens})")
+        
+        # Show reasoning tokens for GPT-5 models
+        if hasattr(response.usage, 'completion_tokens_details'):
+            details = response.usage.completion_tokens_details
+            if hasattr(details, 'reasoning_tokens') and details.reasoning_tokens > 0:
+                logger.info(f"   Reasoning tokens: {details.reasoning_tokens} (internal thinking)")
+                logger.info(f"   Output tokens: {response.usage.completion_tokens - details.reasoning_tokens} (actual response)")
+        
+        logger.info(f"   Response length: {len(content) if content else 0} chars")
+        logger.info(f"   Content type: {type(content)}")
+        logger.info(f"   Content value: {repr(content)}")
+        
+        # Check for empty or None content
+        if content is None:
+            logger.error("⚠️  [WARNING] API returned None content!")
+            logger.error(f"   Full response: {response}")
+            return ""
+        
+        if not content.strip():
+            logger.warning("⚠️  [WARNING] API returned empty content!")
+            logger.warning(f"   Finish reason: {response.choices[0].finish_reason}")
+            logger.warning(f"   Full response: {response}")
+        
+        # Parse JSON if requested
+        if json_mode:
+            import json
+            try:
+                return json.loads(content)
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse JSON response: {content[:200]}")
+                raise ValueError(f"Invalid JSON in response: {str(e)}")
+        
+        return content
+    
+    def vision_completion(
+        self,
+        prompt: str,
+        image_url: Optional[str] = None,
+        image_base64: Optional[str] = None,
+        model: str = OpenAIConfig.DEFAULT_VISION_MODEL,
+        temperature: float = OpenAIConfig.DEFAULT_TEMPERATURE,
+        max_tokens: int = OpenAIConfig.DEFAULT_MAX_TOKENS,
+        system_message: Optional[str] = None,
+        json_mode: bool = False,
+        max_retries: int = 3,
+        image_mime_type: str = "image/jpeg"
+    ) -> Union[str, Dict[str, Any]]:
+        """
+        Vision completion with image + text prompt.
+        
+        Args:
+            prompt: Text prompt describing what to analyze
+            image_url: URL of image to analyze (mutually exclusive with image_base64)
+            image_base64: Base64 encoded image (mutually exclusive with image_url)
+            model: Vision model to use (default: gpt-4o)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            system_message: Optional system message
+            json_mode: If True, forces JSON output
+            max_retries: Number of retry attempts
+            image_mime_type: MIME type used to build the data URI when
+                             image_base64 is raw base64 (default: image/jpeg)
+        
+        Returns:
+            String response or dict if json_mode=True
+            
+        Raises:
+            ValueError: If neither or both image_url and image_base64 provided
+        """
+        params = self._build_vision_params(
+            prompt, image_url, image_base64, model, temperature,
+            max_tokens, system_message, json_mode, image_mime_type
+        )
+        
         # Retry logic
         for attempt in range(1, max_retries + 1):
             try:
@@ -262,43 +371,52 @@ class OpenAIClient:
                 logger.debug(f"   Parameters: {list(params.keys())}")
                 
                 response = self.client.chat.completions.create(**params)
-                content = response.choices[0].message.content
-                
-                logger.info(f"✅ [API-SUCCESS] Vision completion successful")
-                logger.info(f"   Tokens used: {response.usage.total_tokens} (prompt: {response.usage.prompt_tokens}, completion: {response.usage.completion_tokens})")
-                
-                # Show reasoning tokens for GPT-5 models
-                if hasattr(response.usage, 'completion_tokens_details'):
-                    details = response.usage.completion_tokens_details
-                    if hasattr(details, 'reasoning_tokens') and details.reasoning_tokens > 0:
-                        logger.info(f"   Reasoning tokens: {details.reasoning_tokens} (internal thinking)")
-                        logger.info(f"   Output tokens: {response.usage.completion_tokens - details.reasoning_tokens} (actual response)")
-                
-                logger.info(f"   Response length: {len(content) if content else 0} chars")
-                logger.info(f"   Content type: {type(content)}")
-                logger.info(f"   Content value: {repr(content)}")
+                return self._parse_vision_response(response, json_mode)
                 
-                # Check for empty or None content
-                if content is None:
-                    logger.error("⚠️  [WARNING] API returned None content!")
-                    logger.error(f"   Full response: {response}")
-                    return ""
-                
-                if not content.strip():
-                    logger.warning("⚠️  [WARNING] API returned empty content!")
-                    logger.warning(f"   Finish reason: {response.choices[0].finish_reason}")
-                    logger.warning(f"   Full response: {response}")
+            except Exception as e:
+                logger.error(f"Error on attempt {attempt}: {str(e)}")
                 
-                # Parse JSON if requested
-                if json_mode:
-                    import json
-                    try:
-                        return json.loads(content)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse JSON response: {content[:200]}")
-                        raise ValueError(f"Invalid JSON in response: {str(e)}")
+                if attempt < max_retries:
+                    wait_time = 2 ** (attempt - 1)
+                    logger.info(f"Retrying in {wait_time}s...")
+                    time.sleep(wait_time)
+                else:
+                    logger.error(f"Failed after {max_retries} attempts")
+                    raise
+    
+    async def vision_completion_async(
+        self,
+        prompt: str,
+        image_url: Optional[str] = None,
+        image_base64: Optional[str] = None,
+        model: str = OpenAIConfig.DEFAULT_VISION_MODEL,
+        temperature: float = OpenAIConfig.DEFAULT_TEMPERATURE,
+        max_tokens: int = OpenAIConfig.DEFAULT_MAX_TOKENS,
+        system_message: Optional[str] = None,
+        json_mode: bool = False,
+        max_retries: int = 3,
+        image_mime_type: str = "image/jpeg"
+    ) -> Union[str, Dict[str, Any]]:
+        """
+        Async variant of vision_completion using AsyncOpenAI.
+        
+        Takes the same arguments and returns the same result, but awaits the
+        API call (and retry backoff) so many requests can run concurrently.
+        """
+        params = self._build_vision_params(
+            prompt, image_url, image_base64, model, temperature,
+            max_tokens, system_message, json_mode, image_mime_type
+        )
+        
+        # Retry logic
+        for attempt in range(1, max_retries + 1):
+            try:
+                logger.debug(f"Attempt {attempt}/{max_retries}")
+                logger.info(f"🌐 [API-CALL] Calling OpenAI API with model={model}")
+                logger.debug(f"   Parameters: {list(params.keys())}")
                 
-                return content
+                response = await self.async_client.chat.completions.create(**params)
+                return self._parse_vision_response(response, json_mode)
                 
             except Exception as e:
                 logger.error(f"Error on attempt {attempt}: {str(e)}")
@@ -306,7 +424,7 @@ class OpenAIClient:
                 if attempt < max_retries:
                     wait_time = 2 ** (attempt - 1)
                     logger.info(f"Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                 else:
                     logger.error(f"Failed after {max_retries} attempts")
                     raise
@@ -0,0 +1,38 @@
+"""
+Filesystem path helpers.
+"""
+import os
+from collections import defaultdict
+from typing import Iterable, Set
+
+
+def find_existing_paths(paths: Iterable[str]) -> Set[str]:
+    """
+    Return the subset of paths that exist.
+    
+    Lists each parent directory once with os.scandir instead of issuing one
+    stat per path, which matters for large batches on network filesystems.
+    
+    Args:
+        paths: File paths to check
+    
+    Returns:
+        Set of the given paths (exactly as passed in) that are present on disk
+    """
+    paths_by_dir = defaultdict(list)
+    for path in paths:
+        paths_by_dir[os.path.dirname(path)].append(path)
+    
+    existing = set()
+    for dirpath, dir_paths in paths_by_dir.items():
+        try:
+            with os.scandir(dirpath or '.') as entries:
+                present = {entry.name for entry in entries}
+        except OSError:
+            present = set()
+        for path in dir_paths:
+            # A listing miss is not proof of absence (non-normalized paths,
+            # case-insensitive filesystems), so confirm with a real lookup
+            if os.path.basename(path) in present or os.path.exists(path):
+                existing.add(path)
+    return existing
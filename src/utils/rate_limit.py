@@ -0,0 +1,59 @@
+"""
+Rate limiting utilities for external API calls.
+"""
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    
+    Tokens refill continuously at `rate` per second up to `burst`. Each call
+    to take() consumes one token and only sleeps when the bucket is empty,
+    so callers that are already slower than the allowed rate never wait.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            rate: Tokens added per second (sustained request rate)
+            burst: Maximum number of tokens the bucket can hold
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def take(self) -> float:
+        """
+        Consume one token, blocking until it is available.
+        
+        Returns:
+            Seconds spent waiting for the token
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            
+            # Reserve the token; a negative balance is the wait owed
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        
+        if wait > 0:
+            logger.debug(f"Rate limit reached, waiting {wait:.2f}s")
+            time.sleep(wait)
+        
+        return wait
@@ -6,12 +6,14 @@ import os
 import io
 import base64
 import logging
-from typing import Optional, List, Dict, Any, Union, BinaryIO
+from typing import Optional, List, Dict, Any, Union, BinaryIO, Iterator
 from datetime import datetime
 from urllib.parse import urlparse
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
     from botocore.exceptions import ClientError, BotoCoreError
 except ImportError:
     raise ImportError(
@@ -21,6 +23,25 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Content types for image uploads, keyed by file extension
+IMAGE_CONTENT_TYPES = {
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'gif': 'image/gif',
+}
+
+# Transfer settings for streamed uploads. The multipart threshold is kept well
+# above typical image sizes so objects stay single-part and their ETag remains
+# the plain MD5 the UI cache compares against.
+DEFAULT_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True
+)
+
 
 class S3Config:
     """S3 configuration from environment variables."""
@@ -54,7 +75,8 @@ class S3Client:
         self,
         access_key: Optional[str] = None,
         secret_key: Optional[str] = None,
-        region: Optional[str] = None
+        region: Optional[str] = None,
+        config: Optional[Config] = None
     ):
         """
         Initialize S3 client.
@@ -63,6 +85,7 @@ class S3Client:
             access_key: AWS access key (uses AWS_ACCESS_KEY env var if not provided)
             secret_key: AWS secret key (uses AWS_ACCESS_SECRET env var if not provided)
             region: AWS region (uses AWS_REGION env var if not provided)
+            config: Optional botocore Config (e.g. connection pool size, retry mode)
         """
         self.access_key = access_key or S3Config.AWS_ACCESS_KEY
         self.secret_key = secret_key or S3Config.AWS_ACCESS_SECRET
@@ -74,11 +97,16 @@ class S3Client:
                 "environment variables or pass them to the constructor."
             )
         
+        client_kwargs = {}
+        if config is not None:
+            client_kwargs['config'] = config
+        
         self.s3 = boto3.client(
             's3',
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
-            region_name=self.region
+            region_name=self.region,
+            **client_kwargs
         )
         
         logger.debug("AWS S3 client initialized successfully")
@@ -162,15 +190,7 @@ class S3Client:
             Dict with upload information
         """
         # Determine content type
-        content_type_map = {
-            'jpg': 'image/jpeg',
-            'jpeg': 'image/jpeg',
-            'png': 'image/png',
-            'webp': 'image/webp',
-            'gif': 'image/gif',
-        }
-        
-        content_type = content_type_map.get(
+        content_type = IMAGE_CONTENT_TYPES.get(
             extension.lower(),
             'application/octet-stream'
         )
@@ -182,6 +202,68 @@ class S3Client:
             content_type=content_type
         )
     
+    def upload_fileobj(
+        self,
+        fileobj: BinaryIO,
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        content_disposition: str = "inline",
+        metadata: Optional[Dict[str, str]] = None,
+        transfer_config: Optional[TransferConfig] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a file-like object to S3 using the boto3 transfer manager.
+        
+        Unlike upload_file, the body is read from the file object in chunks
+        rather than being handed to put_object as a single buffer.
+        
+        Args:
+            fileobj: Readable binary file-like object (e.g. BytesIO or open file)
+            bucket: S3 bucket name
+            key: S3 object key (path)
+            content_type: MIME type of the file
+            content_disposition: Content disposition header
+            metadata: Optional metadata dict
+            transfer_config: Optional TransferConfig (defaults to DEFAULT_TRANSFER_CONFIG)
+        
+        Returns:
+            Dict with upload information including Location, Bucket, Key
+            
+        Raises:
+            ClientError: If upload fails
+        """
+        logger.info(f"Streaming upload to S3: bucket={bucket}, key={key}")
+        
+        extra_args = {
+            'ContentType': content_type,
+            'ContentDisposition': content_disposition,
+        }
+        if metadata:
+            extra_args['Metadata'] = metadata
+        
+        try:
+            self.s3.upload_fileobj(
+                Fileobj=fileobj,
+                Bucket=bucket,
+                Key=key,
+                ExtraArgs=extra_args,
+                Config=transfer_config or DEFAULT_TRANSFER_CONFIG
+            )
+            
+            result = {
+                'Location': f"https://{bucket}.s3.{self.region}.amazonaws.com/{key}",
+                'Bucket': bucket,
+                'Key': key,
+            }
+            
+            logger.info(f"Successfully uploaded to S3: {result['Location']}")
+            return result
+            
+        except (ClientError, BotoCoreError) as e:
+            logger.error(f"Error uploading to S3: {str(e)}")
+            raise
+    
     def download_file(
         self,
         bucket: str,
@@ -327,6 +409,34 @@ class S3Client:
             logger.error(f"Error listing S3 files: {str(e)}")
             raise
     
+    def iter_files(
+        self,
+        bucket: str,
+        prefix: str = ""
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every file under a prefix, following list pagination.
+        
+        Unlike list_files (a single request, at most 1000 keys), this walks
+        all pages and yields objects as each page arrives.
+        
+        Args:
+            bucket: S3 bucket name
+            prefix: Optional prefix to filter results
+        
+        Yields:
+            Dicts with file information (Key, Size, LastModified, ETag, etc.)
+        """
+        logger.info(f"Listing S3 files: bucket={bucket}, prefix={prefix}")
+        
+        try:
+            paginator = self.s3.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                yield from page.get('Contents', ())
+        except (ClientError, BotoCoreError) as e:
+            logger.error(f"Error listing S3 files: {str(e)}")
+            raise
+    
     def file_exists(
         self,
         bucket: str,
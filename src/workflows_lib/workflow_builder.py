@@ -196,8 +196,12 @@ class WorkflowBuilder:
         if seed == -1:
             seed = random.randint(0, 999999999)
         
-        # Get base workflow
-        workflow = self.template.get("workflow", {}).copy()
+        # Get base workflow. Each node and its inputs are copied so that
+        # parameter updates never leak back into the shared template.
+        workflow = {
+            node_id: {**node, "inputs": dict(node.get("inputs", {}))}
+            for node_id, node in self.template.get("workflow", {}).items()
+        }
         
         # Build LoRA stack
         lora_stack = self.build_lora_stack(
@@ -0,0 +1,49 @@
+"""
+Unit tests for base64 helpers.
+"""
+import base64
+import pytest
+
+from src.utils import fast_base64
+
+
+@pytest.fixture(params=["pybase64", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with pybase64 (if installed) and with the stdlib fallback."""
+    if request.param == "pybase64":
+        if fast_base64.pybase64 is None:
+            pytest.skip("pybase64 not installed")
+    else:
+        monkeypatch.setattr(fast_base64, "pybase64", None)
+    return request.param
+
+
+class TestFastBase64:
+    """Test fast_base64 helpers."""
+    
+    def test_b64encode_matches_stdlib(self, backend):
+        """Test encoding returns the same str as the standard library."""
+        data = bytes(range(256)) * 4
+        
+        result = fast_base64.b64encode(data)
+        
+        assert isinstance(result, str)
+        assert result == base64.b64encode(data).decode('ascii')
+    
+    def test_b64encode_accepts_memoryview(self, backend):
+        """Test encoding a buffer without copying it to bytes first."""
+        data = bytearray(b"\xff\xd8\xff\xe0jpeg")
+        
+        assert fast_base64.b64encode(memoryview(data)) == base64.b64encode(data).decode('ascii')
+    
+    def test_b64decode_round_trip(self, backend):
+        """Test decoding str and bytes input."""
+        data = b"\x00\x01binary\xfe\xff"
+        encoded = base64.b64encode(data)
+        
+        assert fast_base64.b64decode(encoded) == data
+        assert fast_base64.b64decode(encoded.decode('ascii')) == data
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,62 @@
+"""
+Unit tests for JSON serialization helpers.
+"""
+import json
+import pytest
+
+from src.utils import fast_json
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (if installed) and with the stdlib fallback."""
+    if request.param == "orjson":
+        if fast_json.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    return request.param
+
+
+class TestFastJson:
+    """Test fast_json helpers."""
+    
+    def test_dumps_compact(self, backend):
+        """Test compact output round-trips and has no whitespace."""
+        data = {"images": {"a.jpg": {"index": 1, "prompt": "café"}}}
+        result = fast_json.dumps(data)
+        
+        assert isinstance(result, bytes)
+        assert b" " not in result.replace("café".encode(), b"")
+        assert json.loads(result) == data
+    
+    def test_dumps_indent_matches_stdlib(self, backend):
+        """Test indented output matches json.dumps(indent=2)."""
+        data = {"a": [1, 2], "b": {"c": None}}
+        result = fast_json.dumps(data, indent=True)
+        
+        assert result.decode() == json.dumps(data, indent=2)
+    
+    def test_file_round_trip(self, backend, tmp_path):
+        """Test writing and reading a file."""
+        data = {"files": ["x.jpg"], "count": 1}
+        path = tmp_path / "data.json"
+        
+        fast_json.dump_file(data, path, indent=True)
+        
+        assert fast_json.load_file(path) == data
+        assert fast_json.loads(path.read_text()) == data
+    
+    def test_atomic_dump_replaces_file(self, backend, tmp_path):
+        """Test atomic writes replace the file and leave no temp files behind."""
+        path = tmp_path / "manifest.json"
+        path.write_text('{"old": true}')
+        
+        fast_json.dump_file({"new": True}, path, indent=True, atomic=True)
+        
+        assert fast_json.load_file(path) == {"new": True}
+        assert [p.name for p in tmp_path.iterdir()] == ["manifest.json"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -15,6 +15,8 @@ from src.utils.image_processing import (
     get_image_info,
     create_thumbnail,
     validate_image,
+    resize_image_for_gpt,
+    resize_image_for_gpt_cached,
 )
 
 
@@ -231,5 +233,58 @@ class TestValidateImage:
         assert validate_image(img) is True
 
 
+class TestResizeImageForGpt:
+    """Test resize_image_for_gpt and its cached variant."""
+    
+    @pytest.fixture
+    def large_jpeg(self, tmp_path):
+        """Write a landscape JPEG larger than the GPT target size."""
+        path = tmp_path / "large.jpg"
+        Image.new('RGB', (2000, 1000), color='blue').save(path, format='JPEG')
+        return path
+    
+    def test_resize_large_jpeg(self, large_jpeg):
+        """Test that the long side is reduced to max_size as a JPEG."""
+        result = resize_image_for_gpt(str(large_jpeg), max_size=500)
+        
+        img = Image.open(BytesIO(base64.b64decode(result)))
+        assert img.format == 'JPEG'
+        assert img.size == (500, 250)
+    
+    def test_rgba_png_is_converted(self, tmp_path):
+        """Test that non-RGB images are converted and small ones kept as is."""
+        path = tmp_path / "small.png"
+        Image.new('RGBA', (100, 50), color=(255, 0, 0, 128)).save(path)
+        
+        img = Image.open(BytesIO(base64.b64decode(resize_image_for_gpt(str(path)))))
+        assert img.mode == 'RGB'
+        assert img.size == (100, 50)
+    
+    def test_cached_result_is_reused(self, large_jpeg, tmp_path, monkeypatch):
+        """Test that a second call is served from the cache directory."""
+        cache_dir = tmp_path / "cache"
+        first = resize_image_for_gpt_cached(str(large_jpeg), cache_dir, max_size=500)
+        assert len(list(cache_dir.iterdir())) == 1
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("cache miss")
+        monkeypatch.setattr(
+            "src.utils.image_processing.resize_image_for_gpt", fail
+        )
+        assert resize_image_for_gpt_cached(str(large_jpeg), cache_dir, max_size=500) == first
+    
+    def test_cache_invalidated_by_changes(self, large_jpeg, tmp_path):
+        """Test that a modified file or different max_size gets a new entry."""
+        cache_dir = tmp_path / "cache"
+        resize_image_for_gpt_cached(str(large_jpeg), cache_dir, max_size=500)
+        resize_image_for_gpt_cached(str(large_jpeg), cache_dir, max_size=400)
+        
+        Image.new('RGB', (1000, 1000), color='green').save(large_jpeg, format='JPEG')
+        result = resize_image_for_gpt_cached(str(large_jpeg), cache_dir, max_size=500)
+        
+        assert len(list(cache_dir.iterdir())) == 3
+        assert Image.open(BytesIO(base64.b64decode(result))).size == (500, 500)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
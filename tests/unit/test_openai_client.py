@@ -0,0 +1,83 @@
+"""
+Unit tests for OpenAI client vision completions.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.utils.openai_client import OpenAIClient
+
+
+def make_response(content):
+    """Build a minimal chat completion response."""
+    response = MagicMock()
+    response.choices[0].message.content = content
+    response.usage.completion_tokens_details = None
+    return response
+
+
+@pytest.fixture
+def client():
+    """OpenAI client with a dummy API key."""
+    return OpenAIClient(api_key="sk-test")
+
+
+class TestVisionCompletionAsync:
+    """Test OpenAIClient.vision_completion_async."""
+    
+    def test_returns_content_and_builds_data_uri(self, client):
+        """Test that raw base64 is sent as a data URI and content is returned."""
+        create = AsyncMock(return_value=make_response("a caption"))
+        client._async_client = MagicMock()
+        client._async_client.chat.completions.create = create
+        
+        result = asyncio.run(client.vision_completion_async(
+            prompt="describe", image_base64="QUJD", model="gpt-4o", max_tokens=50
+        ))
+        
+        assert result == "a caption"
+        params = create.call_args.kwargs
+        assert params["max_tokens"] == 50
+        image = params["messages"][-1]["content"][1]
+        assert image["image_url"]["url"] == "data:image/jpeg;base64,QUJD"
+    
+    def test_image_mime_type_sets_data_uri(self, client):
+        """Test that raw base64 gets a data URI with the given MIME type."""
+        create = AsyncMock(return_value=make_response("ok"))
+        client._async_client = MagicMock()
+        client._async_client.chat.completions.create = create
+        
+        asyncio.run(client.vision_completion_async(
+            prompt="describe", image_base64="QUJD", image_mime_type="image/png"
+        ))
+        
+        image = create.call_args.kwargs["messages"][-1]["content"][1]
+        assert image["image_url"]["url"] == "data:image/png;base64,QUJD"
+    
+    def test_retries_then_succeeds(self, client, monkeypatch):
+        """Test that failed attempts are retried with an async backoff."""
+        monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+        create = AsyncMock(side_effect=[RuntimeError("boom"), make_response("ok")])
+        client._async_client = MagicMock()
+        client._async_client.chat.completions.create = create
+        
+        result = asyncio.run(client.vision_completion_async(
+            prompt="describe", image_url="https://example.com/a.jpg"
+        ))
+        
+        assert result == "ok"
+        assert create.await_count == 2
+    
+    def test_requires_exactly_one_image(self, client):
+        """Test that image_url and image_base64 are mutually exclusive."""
+        with pytest.raises(ValueError):
+            asyncio.run(client.vision_completion_async(prompt="describe"))
+        with pytest.raises(ValueError):
+            asyncio.run(client.vision_completion_async(
+                prompt="describe", image_url="https://x", image_base64="QUJD"
+            ))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
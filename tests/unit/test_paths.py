@@ -0,0 +1,40 @@
+"""
+Unit tests for filesystem path helpers.
+"""
+import pytest
+
+from src.utils.paths import find_existing_paths
+
+
+class TestFindExistingPaths:
+    """Test find_existing_paths function."""
+    
+    def test_returns_existing_and_skips_missing(self, tmp_path):
+        """Test present files are returned and absent ones are not."""
+        (tmp_path / "a.jpg").write_bytes(b"x")
+        present = str(tmp_path / "a.jpg")
+        missing = str(tmp_path / "b.jpg")
+        
+        result = find_existing_paths([present, missing])
+        
+        assert result == {present}
+    
+    def test_non_normalized_path_keyed_by_input(self, tmp_path):
+        """Test a non-normalized path is found and returned exactly as given."""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "b.jpg").write_bytes(b"x")
+        path = str(tmp_path / "a") + "//b.jpg"
+        
+        result = find_existing_paths([path])
+        
+        assert result == {path}
+    
+    def test_missing_directory(self, tmp_path):
+        """Test paths under a missing directory are reported absent."""
+        path = str(tmp_path / "nope" / "c.jpg")
+        
+        assert find_existing_paths([path]) == set()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
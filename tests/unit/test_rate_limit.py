@@ -0,0 +1,83 @@
+"""
+Unit tests for rate limiting utilities.
+"""
+import pytest
+
+from src.utils import rate_limit
+from src.utils.rate_limit import TokenBucket
+
+
+class FakeClock:
+    """Deterministic replacement for time.monotonic/time.sleep."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Patch the rate limiter's clock."""
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(rate_limit.time, "sleep", fake.sleep)
+    return fake
+
+
+class TestTokenBucket:
+    """Test TokenBucket class."""
+    
+    def test_burst_does_not_wait(self, clock):
+        """Test that requests within the burst are not delayed."""
+        bucket = TokenBucket(rate=1.0, burst=3)
+        
+        assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert clock.sleeps == []
+    
+    def test_empty_bucket_waits_for_refill(self, clock):
+        """Test that an empty bucket sleeps until the next token."""
+        bucket = TokenBucket(rate=2.0, burst=1)
+        
+        bucket.take()
+        waited = bucket.take()
+        
+        assert waited == pytest.approx(0.5)
+        assert clock.sleeps == [pytest.approx(0.5)]
+    
+    def test_slow_callers_never_wait(self, clock):
+        """Test that tokens refill while the caller is busy."""
+        bucket = TokenBucket(rate=1.0, burst=1)
+        
+        for _ in range(5):
+            assert bucket.take() == 0.0
+            clock.now += 10.0
+        
+        assert clock.sleeps == []
+    
+    def test_refill_is_capped_at_burst(self, clock):
+        """Test that idle time does not accumulate beyond burst."""
+        bucket = TokenBucket(rate=1.0, burst=2)
+        clock.now += 100.0
+        
+        bucket.take()
+        bucket.take()
+        
+        assert bucket.take() == pytest.approx(1.0)
+    
+    def test_invalid_arguments(self):
+        """Test that invalid rate or burst is rejected."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1.0, burst=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
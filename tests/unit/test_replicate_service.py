@@ -0,0 +1,63 @@
+"""
+Unit tests for Replicate service download helpers.
+"""
+import io
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.replicate_service import ReplicateService, create_download_session
+
+
+class TestCreateDownloadSession:
+    """Test create_download_session function."""
+    
+    def test_adapter_pool_and_retries(self):
+        """Test that HTTPS requests go through a pooled, retrying adapter."""
+        session = create_download_session(pool_size=3)
+        adapter = session.get_adapter("https://replicate.delivery/image.jpg")
+        
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 6
+        assert adapter.max_retries.total == 3
+        assert 503 in adapter.max_retries.status_forcelist
+
+
+class TestReplicateServiceDownloads:
+    """Test ReplicateService download methods."""
+    
+    @pytest.fixture
+    def session(self):
+        """Mock session returning a fixed image payload."""
+        session = MagicMock()
+        response = session.get.return_value
+        response.content = b"image-bytes"
+        response.iter_content.return_value = [b"image-", b"bytes"]
+        response.__enter__.return_value = response
+        return session
+    
+    @pytest.fixture
+    def service(self, session):
+        """Service wired to the mock session."""
+        return ReplicateService(api_token="test-token", session=session)
+    
+    def test_download_image_as_bytes_uses_session(self, service, session):
+        """Test that byte downloads reuse the injected session."""
+        assert service.download_image_as_bytes("https://example.com/a.jpg") == b"image-bytes"
+        session.get.assert_called_once_with("https://example.com/a.jpg", timeout=60)
+    
+    def test_download_image_to_file_uses_session(self, service, session):
+        """Test that streamed downloads reuse the injected session."""
+        buffer = io.BytesIO()
+        
+        written = service.download_image_to_file("https://example.com/a.jpg", buffer)
+        
+        assert written == len(b"image-bytes")
+        assert buffer.getvalue() == b"image-bytes"
+        session.get.assert_called_once_with(
+            "https://example.com/a.jpg", stream=True, timeout=60
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
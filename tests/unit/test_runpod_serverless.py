@@ -0,0 +1,81 @@
+"""
+Unit tests for the RunPod serverless client.
+"""
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from src.runpod.config import RunPodConfig
+from src.runpod.serverless import RunPodServerlessClient, _encode_body
+
+
+class TestEncodeBody:
+    """Test _encode_body function."""
+    
+    def test_round_trips_payload(self):
+        """Test that the encoded body parses back to the same payload."""
+        payload = {'input': {'workflow': {'216': {'inputs': {'base64_data': 'QUJD' * 1000}}}}}
+        
+        body = _encode_body(payload)
+        
+        assert isinstance(body, bytes)
+        assert json.loads(body) == payload
+
+
+class TestRunPodServerlessClient:
+    """Test RunPodServerlessClient request handling."""
+    
+    def test_generate_image_posts_serialized_body(self):
+        """Test that the payload (plus timestamp) is sent as a pre-serialized JSON body."""
+        client = RunPodServerlessClient(api_key="test-key")
+        client.session = MagicMock()
+        client.session.post.return_value.json.return_value = {'status': 'FAILED', 'error': 'x'}
+        payload = {'input': {'workflow': {'1': {'inputs': {'seed': 7}}}, 'model_urls': []}}
+        
+        with patch.object(RunPodConfig, 'get_serverless_endpoint', return_value='endpoint'):
+            client.generate_image(payload, mode='150', request_id='req')
+        
+        kwargs = client.session.post.call_args.kwargs
+        assert 'json' not in kwargs
+        sent = json.loads(kwargs['data'])
+        assert sent['input']['workflow'] == payload['input']['workflow']
+        assert isinstance(sent['input']['timestamp'], int)
+        assert client.headers['Content-Type'] == 'application/json'
+
+    
+    def test_poll_status_stops_on_404(self):
+        """Test that a missing job ends blocking polling with a FAILED result."""
+        client = RunPodServerlessClient(api_key="test-key")
+        client.session = MagicMock()
+        client.session.get.return_value.status_code = 404
+        
+        with patch.object(RunPodConfig, 'POLLING_INTERVAL', 0):
+            data = client._poll_status('endpoint', 'job', 'test')
+        
+        assert data['status'] == 'FAILED'
+        assert data['output']['error'] == 'Job not found'
+        assert client.session.get.call_count == 1
+    
+    def test_poll_status_async_returns_terminal_status(self):
+        """Test that async polling keeps going until the job reaches a terminal status."""
+        client = RunPodServerlessClient(api_key="test-key")
+        statuses = iter(['IN_PROGRESS', 'COMPLETED'])
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json={'id': 'job', 'status': next(statuses)})
+        )
+        
+        async def poll():
+            async with httpx.AsyncClient(transport=transport) as http:
+                return await client._poll_status_async(http, 'endpoint', 'job', 'test')
+        
+        with patch.object(RunPodConfig, 'POLLING_INTERVAL', 0):
+            data = asyncio.run(poll())
+        
+        assert data['status'] == 'COMPLETED'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -85,6 +85,35 @@ class TestS3Client:
         
         mock_s3.put_object.assert_called_once()
     
+    @patch('boto3.client')
+    def test_upload_fileobj(self, mock_boto_client):
+        """Test streamed upload through the transfer manager."""
+        mock_s3 = Mock()
+        mock_boto_client.return_value = mock_s3
+        
+        client = S3Client(
+            access_key="test_key",
+            secret_key="test_secret"
+        )
+        
+        buffer = BytesIO(b"image data")
+        result = client.upload_fileobj(
+            fileobj=buffer,
+            bucket="test-bucket",
+            key="test/image.jpg",
+            content_type="image/jpeg"
+        )
+        
+        assert result['Bucket'] == "test-bucket"
+        assert result['Key'] == "test/image.jpg"
+        assert 'Location' in result
+        
+        mock_s3.upload_fileobj.assert_called_once()
+        kwargs = mock_s3.upload_fileobj.call_args.kwargs
+        assert kwargs['Fileobj'] is buffer
+        assert kwargs['ExtraArgs']['ContentType'] == "image/jpeg"
+        mock_s3.put_object.assert_not_called()
+    
     @patch('boto3.client')
     def test_download_file(self, mock_boto_client):
         """Test file download."""
@@ -165,6 +194,30 @@ class TestS3Client:
             {'Error': {'Code': '404'}}, 'HeadObject'
         )
         assert client.file_exists("test-bucket", "missing.txt") is False
+    
+    @patch('boto3.client')
+    def test_iter_files_follows_pages(self, mock_boto_client):
+        """Test that iter_files yields objects from every page."""
+        mock_s3 = Mock()
+        mock_s3.get_paginator.return_value.paginate.return_value = iter([
+            {'Contents': [{'Key': 'styles/1/a.jpg'}, {'Key': 'styles/1/b.jpg'}]},
+            {},
+            {'Contents': [{'Key': 'styles/1/c.jpg'}]}
+        ])
+        mock_boto_client.return_value = mock_s3
+        
+        client = S3Client(
+            access_key="test_key",
+            secret_key="test_secret"
+        )
+        
+        keys = [f['Key'] for f in client.iter_files("test-bucket", "styles/1/")]
+        
+        assert keys == ['styles/1/a.jpg', 'styles/1/b.jpg', 'styles/1/c.jpg']
+        mock_s3.get_paginator.assert_called_once_with('list_objects_v2')
+        mock_s3.get_paginator.return_value.paginate.assert_called_once_with(
+            Bucket="test-bucket", Prefix="styles/1/"
+        )
 
 
 if __name__ == "__main__":